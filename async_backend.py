@@ -0,0 +1,220 @@
+import asyncio
+import contextvars
+import os
+import time
+import functools
+
+import httpx
+from dotenv import load_dotenv
+
+import fetch_engine
+import instrumentation
+import metrics
+import scheduler
+
+# Maximum number of requests in flight at once; also the size of the connection pool
+DEFAULT_MAX_CONCURRENCY = 20
+PER_PAGE = 100
+
+
+# --- Timer decorator (async version of backend.time_it) ---
+def time_it(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start_time = time.perf_counter()
+        with metrics.registry.track(f"async.{func.__name__}"):
+            result = await func(*args, **kwargs)
+        duration = time.perf_counter() - start_time
+        print(f"--- Task '{func.__name__}' completed in {duration:.2f} seconds. ---")
+        return result
+    return wrapper
+
+
+class AsyncGitLab:
+    """
+    Async GitLab REST client. All requests share one pooled httpx.AsyncClient and
+    a semaphore caps how many of them are in flight. Each request is also admitted
+    by the process-wide scheduler.RequestScheduler (the one the python-gitlab client
+    uses), so both share the priorities and the rate-limit budget, and is recorded
+    in the instrumentation log. The HTTP response cache is not used here.
+    Use as `async with AsyncGitLab(url, token) as client: ...`
+    """
+    def __init__(self, url, private_token, max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=30.0):
+        self.api_url = f"{url.rstrip('/')}/api/v4"
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.scheduler = scheduler.get_scheduler(max_limit=max_concurrency)
+        self.client = httpx.AsyncClient(
+            headers={"PRIVATE-TOKEN": private_token},
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            timeout=timeout,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def request(self, method, path, params=None, json=None):
+        """Sends one request and returns the httpx.Response (raises httpx.HTTPStatusError on 4xx/5xx)."""
+        async with self.semaphore:
+            # 429s are retried like scheduler.ScheduledAdapter does: the scheduler pauses until Retry-After
+            for attempt in range(scheduler.MAX_THROTTLE_RETRIES + 1):
+                await self._admit()
+                response = None
+                try:
+                    response = await self.client.request(method, f"{self.api_url}{path}", params=params, json=json)
+                finally:
+                    self.scheduler.release(response)
+                instrumentation.record_response(response)
+                if response.status_code != 429:
+                    break
+        response.raise_for_status()
+        return response
+
+    async def _admit(self):
+        """Waits for a scheduler slot (RequestScheduler.acquire blocks, so it runs in a worker thread)."""
+        loop = asyncio.get_running_loop()
+        admitted = loop.run_in_executor(None, contextvars.copy_context().run,
+                                        self.scheduler.acquire, scheduler.current_priority())
+        try:
+            await asyncio.shield(admitted)
+        except asyncio.CancelledError:
+            # The worker may still get the slot: give it back once it does
+            admitted.add_done_callback(lambda f: f.cancelled() or f.exception() or self.scheduler.release())
+            raise
+
+    async def get(self, path, params=None):
+        response = await self.request("GET", path, params=params)
+        return response.json()
+
+    async def get_all(self, path, params=None):
+        """
+        Returns every item of a paginated list. When GitLab reports the page count
+        (X-Total-Pages) the remaining pages are requested concurrently, otherwise
+        the pages are followed one by one.
+        """
+        params = dict(params or {}, per_page=PER_PAGE, page=1)
+        first = await self.request("GET", path, params=params)
+        items = first.json()
+        total_pages = first.headers.get("X-Total-Pages")
+        if total_pages:
+            pages = await asyncio.gather(*(
+                self.get(path, dict(params, page=page)) for page in range(2, int(total_pages) + 1)
+            ))
+            for page in pages:
+                items.extend(page)
+            return items
+
+        next_page = first.headers.get("X-Next-Page")
+        while next_page:
+            response = await self.request("GET", path, params=dict(params, page=int(next_page)))
+            items.extend(response.json())
+            next_page = response.headers.get("X-Next-Page")
+        return items
+
+
+### 1. Connection
+async def connect_to_gitlab(max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Creates the shared async client from the .env settings and verifies the token."""
+    load_dotenv()
+    url, token = os.environ.get("GITLAB_URL"), os.environ.get("GITLAB_PRIVATE_TOKEN")
+    if not url or not token:
+        print("Authentication failed: GITLAB_URL and GITLAB_PRIVATE_TOKEN must be set")
+        return None
+    client = AsyncGitLab(url, token, max_concurrency=max_concurrency)
+    try:
+        await client.get("/user")
+        print("Authentication successful! ✅")
+        return client
+    except httpx.HTTPError as e:
+        print(f"Authentication failed: {e}")
+        await client.close()
+
+
+### 2. Listing
+@time_it
+async def list_projects(client):
+    return await client.get_all("/projects", {"owned": True})
+
+@time_it
+async def list_groups(client):
+    return await client.get_all("/groups", {"owned": True})
+
+@time_it
+async def get_project_summary(client, project_id):
+    """Returns the failing pipelines, open issues and 5 latest commits of a project, fetched concurrently."""
+    path = f"/projects/{project_id}"
+    project, failing_pipelines, open_issues, commits = await asyncio.gather(
+        client.get(path),
+        client.get_all(f"{path}/pipelines", {"status": "failed"}),
+        client.get_all(f"{path}/issues", {"state": "opened"}),
+        client.get(f"{path}/repository/commits", {"per_page": 5}),
+    )
+    return {
+        "project_id": project["id"],
+        "name_with_namespace": project["name_with_namespace"],
+        "failing_pipelines": [{"id": p["id"], "ref": p["ref"]} for p in failing_pipelines],
+        "open_issues": [{"iid": i["iid"], "title": i["title"]} for i in open_issues],
+        "recent_commits": [{"short_id": c["short_id"], "author_name": c["author_name"], "title": c["title"]}
+                           for c in commits],
+    }
+
+
+### 3. Analytics
+# Same results as the backend reports, but read straight from the API
+@time_it
+async def issue_completion_report(client, project_id):
+    closed_issues = await client.get_all(f"/projects/{project_id}/issues", {"state": "closed"})
+    durations = [fetch_engine.duration_seconds(i["created_at"], i["closed_at"]) for i in closed_issues]
+    durations = [d for d in durations if d is not None]
+    return {
+        "project_id": int(project_id),
+        "closed_issues": len(closed_issues),
+        "average": sum(durations) / len(durations) if durations else None,
+    }
+
+@time_it
+async def pipeline_successful_report(client, project_id):
+    pipelines = await client.get_all(f"/projects/{project_id}/pipelines")
+    total_pipeline_run = len(pipelines)
+    total_successful_pipelines = sum(1 for p in pipelines if p["status"] == "success")
+    return {
+        "project_id": int(project_id),
+        "total_pipelines": total_pipeline_run,
+        "successful_pipelines": total_successful_pipelines,
+        "success_rate": round(total_successful_pipelines / total_pipeline_run * 100 if total_pipeline_run > 0 else 0, 1),
+    }
+
+@time_it
+async def pipeline_run_time_report(client, project_id):
+    path = f"/projects/{project_id}/pipelines"
+    pipelines = await client.get_all(path)
+    # The detail calls all go out together, bounded by the client's semaphore
+    details = await asyncio.gather(*(client.get(f"{path}/{p['id']}") for p in pipelines), return_exceptions=True)
+    timings = []
+    for pipeline in details:
+        if isinstance(pipeline, Exception):
+            print(f"Error retrieving pipeline: {pipeline}")
+            continue
+        seconds = fetch_engine.duration_seconds(pipeline["started_at"], pipeline["finished_at"])
+        if seconds is not None:
+            timings.append((pipeline["ref"], seconds))
+    report = fetch_engine.summarise_timings(timings)
+    report["project_id"] = int(project_id)
+    report["total_pipelines"] = len(pipelines)
+    return report
+
+
+### 4. Fan-out
+async def for_each_project(client, func, project_ids):
+    """
+    Runs func(client, project_id) for every project at once and returns a dict
+    project_id -> result (or the exception raised for that project).
+    """
+    project_ids = list(project_ids)
+    results = await asyncio.gather(*(func(client, pid) for pid in project_ids), return_exceptions=True)
+    return dict(zip(project_ids, results))
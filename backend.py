@@ -3,8 +3,26 @@ import gitlab
 import sys
 import time
 import functools
-from dotenv import load_dotenv
-from datetime import datetime, timedelta
+import collections
+import requests
+from datetime import timedelta
+
+import catalog
+import columnar
+import fetch_engine
+import gitlab_client
+import http_cache
+import instrumentation
+import membership
+import metrics
+import mirror
+import object_cache
+import portfolio
+import provisioning
+import scheduler
+import sharing
+import streaming
+import template_sync
 
 # --- Configuration ---
 # Project's actual ID
@@ -19,7 +37,9 @@ access_levels = {
 def time_it(func):
     """
     A decorator that times the execution of a function.
-    It returns origianl result of the function and prints the time taken to execute it.
+    Every call is recorded in metrics.registry (call count, error count, in-flight
+    calls and latency histogram) and the HTTP requests it makes are counted by
+    instrumentation; it returns the original result and prints the time taken.
     """
     # functools.wraps preserves the original function's metadata (name, docstring, etc.)
     @functools.wraps(func)
@@ -27,17 +47,15 @@ def time_it(func):
         # 1. Start the timer using a high-precision counter
         start_time = time.perf_counter()
         
-        # 2. Run the original function and store its result
-        result = func(*args, **kwargs)
+        # 2. Run the original function (tracked by the metrics registry) and store its result
+        with instrumentation.scope(func.__name__) as calls, metrics.registry.track(func.__name__):
+            result = func(*args, **kwargs)
         
-        # 3. Stop the timer
-        end_time = time.perf_counter()
+        # 3. Calculate the duration
+        duration = time.perf_counter() - start_time
         
-        # 4. Calculate the duration
-        duration = end_time - start_time
-        
-        # 5. Printing the time used
-        print(f"--- Task '{func.__name__}' completed in {duration:.2f} seconds. ---")
+        # 4. Printing the time used
+        print(f"--- Task '{func.__name__}' completed in {duration:.2f} seconds ({calls.requests} requests). ---")
         
         # Return ONLY the original result
         return result
@@ -48,27 +66,27 @@ def time_it(func):
 ### 1. Connection and initial setup
 @time_it
 def connect_to_gitlab():
-    load_dotenv()
-    private_token = os.environ.get("GITLAB_PRIVATE_TOKEN")
-    gitlab_url = os.environ.get("GITLAB_URL")
-
-    """Connects to GitLab and runs the report."""
+    """Returns the shared GitLab client; it is created and authenticated only once per process."""
     try:
-        # This just creates the object; no API call is made yet.
-        gl = gitlab.Gitlab(gitlab_url, private_token=private_token)
-
-        # This is the line that makes the API call to verify the token.
-        # It will throw a GitlabError if the token is invalid or lacks permissions.
-        gl.auth()
+        gl = gitlab_client.get_client()
         print("Authentication successful! ✅")
         return gl
     except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
         print(f"Authentication failed: {e}")
 
 @time_it
 def variable_setup(gl, namespace_id, token):
+    """Makes sure the group has the GITLAB_PRIVATE_TOKEN variable; returns True once it exists."""
     try:
-        group = gl.groups.get(namespace_id)
+        group = gl.groups.get(namespace_id, lazy=True)
+        try:
+            group.variables.get('GITLAB_PRIVATE_TOKEN')
+            print("Token variable already exists in the group.")
+            return True
+        except gitlab.exceptions.GitlabGetError as e:
+            if e.response_code != 404:
+                raise
         # Set up private token as a group variable
         token_var = group.variables.create({'key': 'GITLAB_PRIVATE_TOKEN', 'value': token})
         if token_var:
@@ -76,6 +94,7 @@ def variable_setup(gl, namespace_id, token):
         else:
             return False
     except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
         print(f"Failed to create token variable in gitlab: {e}")
 
 
@@ -83,52 +102,28 @@ def variable_setup(gl, namespace_id, token):
 @time_it
 def load_project_template(gl, project_id):
     try:
-        project = gl.projects.get(project_id)
+        project = object_cache.get_project(gl, project_id)
     except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
         print(f"Error loading template project: {e}")
-    if not project:
-        print("❌ Project not found.")
         return
-    # Add default files to the template project
-    # 1. Define the files to be added and their local paths
-    default_files = {
-        '.gitlab-ci.yml': 'template/template.yml',
-        '.gitignore': 'template/gitignore.txt',
-        'cliff.toml': 'template/cliff.toml',
-        'public/index.html': 'template/index.html',
-        'create_failure_issue.py': 'template/create_failure_issue.py',
-    }
-    # 2. Read the content of the local file
     try:
-        for repo_path, local_path in default_files.items():
-            print(f"Reading content from {local_path}...")
-            with open(local_path, "r") as f:
-                file_content = f.read()
-            file_data = {
-            'file_path': repo_path,
-            'branch': 'main',   
-            'content': file_content,
-            'commit_message': f'Add default CI/CD file {repo_path}'
-        }
-
-            # 3. Create the file using the API
-            new_file = project.files.create(file_data)
-            print(f"Successfully uploaded {local_path} to the template project {repo_path}...")
-
-        print(f"✅ Successfully added all default files to the project {project.name_with_namespace}.")
-
-    except FileNotFoundError:
-        print(f"❌ Error: The {local_path} file was not found in the same directory as the script.")
+        actions = provisioning.read_template_files()
+        provisioning.commit_template_files(project, actions)
+        print(f"✅ Successfully added all default files to the project {project.name_with_namespace} in one commit.")
+    except FileNotFoundError as e:
+        metrics.record_error()
+        print(f"❌ Error: The {e.filename} file was not found in the same directory as the script.")
     except gitlab.exceptions.GitlabError as e:
-        print(f"❌ An error occurred while creating the file: {e.error_message}")
+        metrics.record_error()
+        print(f"❌ An error occurred while creating the files: {e.error_message}")
 
 
 ### 3. Project member management
 @time_it
 def list_members_in_project(project):
-    # Get a list of all members in the project
-        members = project.members.list(all=True)
-        for member in members:
+    # Stream the members of the project page by page
+        for member in streaming.iter_members(project):
             print(f"  - User ID: {member.id}, Username: {member.username}, Access Level: {member.access_level}")
 
 @time_it
@@ -136,54 +131,68 @@ def add_member_to_project(project, user_id, access_level):
     # Add a member to the project
     try:
         project.members.create({'user_id': user_id, 'access_level': access_level})
+        object_cache.invalidate_project_member(project.id, user_id)
         print(f"Member with ID {user_id} added with access level {access_level}.")
     except gitlab.exceptions.GitlabCreateError as e:
+        metrics.record_error()
         print(f"Error adding member: {e}")
 
 @time_it
 def remove_member_from_project(project, user_id):
     # Remove a member from the project
     try:
-        member = project.members.get(user_id)
+        member = object_cache.get_project_member(project, user_id)
     except gitlab.exceptions.GitlabGetError as e:
+        metrics.record_error()
         print(f"Error in retrieving user: {e}")
     try:
         member.delete()
+        object_cache.invalidate_project_member(project.id, user_id)
         print(f"Member with ID {user_id} removed successfully.")
     except gitlab.exceptions.GitlabDeleteError as e:
+        metrics.record_error()
         print(f"Error removing member: {e}")
 
 # Change member access level in a project
 @time_it
 def change_member_access_level(project, user_id, new_access_level):
     try:
-        member = project.members.get(user_id)
+        member = object_cache.get_project_member(project, user_id)
         try:
             member.access_level = access_levels[new_access_level]
             member.save()
+            object_cache.invalidate_project_member(project.id, user_id)
             print(f"Access level for user ID {user_id} in project ID {project.id} changed to {new_access_level}.")
             return True
-        except gitlab.exceptions.GitlabUpdateError as e:
+        except (gitlab.exceptions.GitlabUpdateError, requests.RequestException) as e:
+            metrics.record_error()
+            # The cached member already holds the new level, which was never applied
+            object_cache.invalidate_project_member(project.id, user_id)
             print(f"Error changing access level: {e}")
             return False
     except gitlab.exceptions.GitlabGetError as e:
+        metrics.record_error()
         print(f"Error in retrieving user: {e}")
 
 # Change member access level in a group
 @time_it
 def change_member_access_level_in_group(gl, user_id, group_id, new_access_level):
     try:
-        group = gl.groups.get(group_id)
-        member = group.members.get(user_id)
+        member = object_cache.get_group_member(gl, group_id, user_id)
         try:
             member.access_level = access_levels[new_access_level]
             member.save()
+            object_cache.invalidate_group_member(group_id, user_id)
             print(f"Access level for user ID {user_id} in group ID {group_id} changed to {new_access_level}.")
             return True
-        except gitlab.exceptions.GitlabUpdateError as e:
+        except (gitlab.exceptions.GitlabUpdateError, requests.RequestException) as e:
+            metrics.record_error()
+            # The cached member already holds the new level, which was never applied
+            object_cache.invalidate_group_member(group_id, user_id)
             print(f"Error changing access level: {e}")
             return False
     except gitlab.exceptions.GitlabGetError as e:
+        metrics.record_error()
         print(f"Error in retrieving user: {e}")
 
 
@@ -193,9 +202,11 @@ def create_group(gl, group_name, parent_id):
     try:
         group_path = f"test-subgroup-{os.urandom(4).hex()}" # Unique path to avoid errors
         group = gl.groups.create({'name': group_name, 'path': group_path, 'parent_id': parent_id})
+        object_cache.get_cache().put(object_cache.GROUP, group.id, group)
         print(f"Group created successfully: {group.name}")
         return group
     except gitlab.exceptions.GitlabCreateError as e:
+        metrics.record_error()
         print(f"Error creating group: {e}")
         return None
     
@@ -203,129 +214,221 @@ def create_group(gl, group_name, parent_id):
 @time_it
 def list_groups(gl):
     try:
-        groups = gl.groups.list(owned=True, all=True)
-        return groups
+        return list(streaming.iter_groups(gl, owned=True))
     except gitlab.exceptions.GitlabGetError as e:
+        metrics.record_error()
         print(f"Error retrieving groups: {e}")
 
 # List members in a group
 @time_it
 def list_user_in_group(gl, group_id):
     try:
-        group = gl.groups.get(group_id)
-        members = group.members.list(all=True)
-        for member in members:
+        group = object_cache.get_group(gl, group_id)
+        for member in streaming.iter_members(group):
             print(f"  - User ID: {member.id}, Username: {member.username}, Access Level: {member.access_level}")
     except gitlab.exceptions.GitlabGetError as e:
+        metrics.record_error()
         print(f"Error retrieving group members: {e}")
 
 # Checker function for user in a specific group
 @time_it
 def checker_user_in_group(gl, group_id, user_id):
     try:
-        group = gl.groups.get(group_id)
-        return group.members.get(user_id)
+        return object_cache.get_group_member(gl, group_id, user_id)
     except gitlab.exceptions.GitlabError as e:
+        # Not a member is an answer, not a failure
+        if getattr(e, "response_code", None) != 404:
+            metrics.record_error()
         print(f"Error in checking user status in group: {e}/ User not found")
 
 # Adding user to existing group
 @time_it
 def add_user_to_group(gl, user_id, group_id, access_level):
     try:
-        group = gl.groups.get(group_id)
+        group = object_cache.get_group(gl, group_id)
         member = group.members.create({'user_id': user_id, 'access_level': access_level})
+        object_cache.invalidate_group_member(group_id, user_id)
         print(f"User with ID {user_id} added to group {group.name} with access level {access_level}.")
     except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
         print(f"Error adding user to group: {e}")
 
 # Removing user from existing group
 @time_it
 def remove_user_from_group(gl, user_id, group_id):
     try:
-        group = gl.groups.get(group_id)
+        group = object_cache.get_group(gl, group_id)
         group.members.delete(user_id)
+        object_cache.invalidate_group_member(group_id, user_id)
         print(f"User with ID {user_id} removed from group {group.name}.")
     except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
         print(f"Error removing user from group: {e}")
 
 
+# Bulk membership from a desired-state file (CSV or YAML of group, user, role)
+@time_it
+def apply_membership_file(gl, path, prune=False, dry_run=False):
+    try:
+        entries = membership.load_desired_state(path)
+        result = membership.sync_memberships(gl, entries, prune=prune, dry_run=dry_run)
+    except (OSError, KeyError, ValueError, gitlab.exceptions.GitlabError, requests.RequestException) as e:
+        metrics.record_error()
+        print(f"Error applying membership file: {e}")
+        return None
+
+    operations = result["operations"]
+    counts = collections.Counter(op.action for op in operations)
+    print(f"Membership plan for {len(entries)} entries: {counts['add']} to add, {counts['update']} to update, {counts['remove']} to remove.")
+    if dry_run:
+        for op in operations:
+            print(f"  - {op.action} user {op.user_id} in group {op.group_id}" + (f" as {op.access_level}" if op.access_level else ""))
+        return result
+    for op, e in result["errors"].items():
+        metrics.record_error()
+        print(f"❌ Failed to {op.action} user {op.user_id} in group {op.group_id}: {e}")
+    print(f"✅ Applied {len(result['applied'])} of {len(operations)} membership changes.")
+    return result
+
+
 ### 4. Project creation
 @time_it
 def create_project(gl, project_name, namespace_id):
     try:
-        project = gl.projects.create({'name': project_name, 'namespace_id': namespace_id, 'initialize_with_readme': True})
+        start_time = time.perf_counter()
+        project, timings, error = provisioning.provision_project(gl, project_name, namespace_id)
         print(f"Project created successfully: {project.name_with_namespace}")
-        # Create default project protected tag rule
-        protected_tag = project.protectedtags.create({'name': 'v*', 'create_access_level': gitlab.const.AccessLevel.MAINTAINER})
-        # Create default project tag
-        tag = project.tags.create({
-            'tag_name': 'v1.0.0',
-            'ref': 'main'
-        })
-        load_project_template(gl, project.id)
+        if error:
+            metrics.record_error()
+            print(f"❌ Provisioning of {project.name_with_namespace} stopped: {error}")
+        steps = ", ".join(f"{step} {seconds:.2f}s" for step, seconds in timings.items())
+        print(f"Provisioned in {time.perf_counter() - start_time:.2f} seconds ({steps}).")
         return project
     except gitlab.exceptions.GitlabCreateError as e:
+        metrics.record_error()
         print(f"Error creating project: {e}")
         return None
 
 
+# Batch creation from a manifest (CSV or YAML of name, group)
+@time_it
+def provision_projects_from_manifest(gl, path, default_group=None, max_workers=provisioning.DEFAULT_MAX_WORKERS):
+    try:
+        entries = provisioning.load_manifest(path)
+        results = provisioning.provision_all(gl, entries, default_group=default_group, max_workers=max_workers)
+    except (OSError, KeyError, gitlab.exceptions.GitlabError) as e:
+        metrics.record_error()
+        print(f"Error provisioning projects from manifest: {e}")
+        return None
+
+    for r in results:
+        if r["status"] == "created":
+            print(f"  ✅ {r['project'].name_with_namespace} in {r['seconds']:.2f}s")
+        elif r["status"] == "partial":
+            print(f"  ⚠️ {r['project'].name_with_namespace} created, but provisioning stopped: {r['error']}")
+        else:
+            print(f"  ❌ {r['name']} in group {r['group']}: {r['error']}")
+    counts = collections.Counter(r["status"] for r in results)
+    if counts["partial"] or counts["failed"]:
+        metrics.record_error()
+    print(f"Provisioned {len(results)} projects: {counts['created']} created, {counts['partial']} partial, {counts['failed']} failed.")
+    return results
+
+
+# Push template changes to existing projects (one commit per project that differs)
+@time_it
+def sync_template_fleet(gl, dry_run=False, max_workers=template_sync.DEFAULT_MAX_WORKERS):
+    try:
+        results = template_sync.sync_fleet(gl, dry_run=dry_run, max_workers=max_workers)
+    except (OSError, gitlab.exceptions.GitlabError) as e:
+        metrics.record_error()
+        print(f"Error syncing template: {e}")
+        return None
+
+    for r in sorted(results.values(), key=lambda r: r["name"]):
+        if r["status"] in ("updated", "would_update"):
+            verb = "updated" if r["status"] == "updated" else "would update"
+            print(f"  🔄 {r['name']}: {verb} {', '.join(r['files'])}")
+        elif r["status"] == "failed":
+            print(f"  ❌ {r['name']}: {r['error']}")
+    counts = collections.Counter(r["status"] for r in results.values())
+    if counts["failed"]:
+        metrics.record_error()
+    print(f"Template sync over {len(results)} projects: {counts['up_to_date']} up to date, "
+          f"{counts['updated'] + counts['would_update']} {'to update' if dry_run else 'updated'}, {counts['failed']} failed.")
+    return results
+
+
 ### 5. Project listing
 @time_it
 def list_projects(gl):
     # list all the projects that are owned by the account
-    projects = gl.projects.list(owned=True, all=True)
-    return projects
-    for project in projects:
-        print(f"Name: {project.name_with_namespace}")
+    return list(streaming.iter_projects(gl, owned=True))
+
+@time_it
+def project_names(gl):
+    """Returns {project_id: {"name": name_with_namespace, "path": path_with_namespace}} of the owned projects, in one pass."""
+    return {project.id: {"name": project.name_with_namespace, "path": project.path_with_namespace}
+            for project in streaming.iter_projects(gl, owned=True)}
     
 @time_it
 def get_project_by_id(gl, project_id):
-    project = gl.projects.get(project_id)
-    return project
+    return object_cache.get_project(gl, project_id)
 
 @time_it
 def get_project_summary(project):
     """Fetches and prints the summary for a given project."""
     print(f"\n--- Summary for {project.name_with_namespace} ---")
 
-    # Fetch and print failing pipelines
+    # Stream and print failing pipelines
     print("\n🚨 Failing Pipelines:")
-    failing_pipelines = project.pipelines.list(status='failed', all=True)
-    if failing_pipelines:
-        for pipeline in failing_pipelines:
-            print(f"  - ID: {pipeline.id} on branch '{pipeline.ref}'")
-    else:
+    failing_pipelines = 0
+    for pipeline in streaming.iter_pipelines(project, status='failed'):
+        print(f"  - ID: {pipeline.id} on branch '{pipeline.ref}'")
+        failing_pipelines += 1
+    if not failing_pipelines:
         print("  No failing pipelines found.")
 
-    # Fetch and print open issues
+    # Stream and print open issues
     print("\n📝 Open Issues:")
-    open_issues = project.issues.list(state='opened', all=True)
-    if open_issues:
-        for issue in open_issues:
-            print(f"  - #{issue.iid}: {issue.title}")
-    else:
+    open_issues = 0
+    for issue in streaming.iter_issues(project, state='opened'):
+        print(f"  - #{issue.iid}: {issue.title}")
+        open_issues += 1
+    if not open_issues:
         print("  No open issues found.")
 
-    # Fetch and print recent commits
+    # Fetch and print recent commits (first page only)
     print("\n💬 Recent Commits:")
-    commits = project.commits.list(all=True, query_parameters={'per_page': 5})
+    commits = project.commits.list(per_page=5, get_all=False)
     if commits:
         for commit in commits:
             print(f"  - {commit.short_id} by {commit.author_name}: {commit.title}")
     else:
         print(" No commits found.")
 
+# Group -> project tree of the account (two paginated calls); None if a listing failed
+@time_it
+def load_catalog(gl):
+    try:
+        return catalog.build_catalog(gl)
+    except (gitlab.exceptions.GitlabError, requests.RequestException) as e:
+        metrics.record_error()
+        print(f"Error building group/project catalog: {e}")
+        return None
+
 ### 6. Project sharing
 # Obtaining project group data
 @time_it
 def fetch_project_group_data(gl, project_id):
     try:
-        project = gl.projects.get(project_id)
-        all_groups = gl.groups.list(owned=True, get_all=True)
+        project = object_cache.get_project(gl, project_id)
+        all_groups = list_groups(gl)
         shared_groups = project.shared_with_groups
         return project, all_groups, shared_groups
 
     except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
         print(f"Error retrieving project or groups: {e}")
         return None, None, None
 
@@ -333,156 +436,224 @@ def fetch_project_group_data(gl, project_id):
 @time_it
 def share_project_with_group(gl, project_id, group_id):
     try:
-        project = gl.projects.get(project_id)
-        group = gl.groups.get(group_id)
+        project = object_cache.get_project(gl, project_id)
+        group = object_cache.get_group(gl, group_id)
         project.share(group.id, gitlab.const.AccessLevel.MAINTAINER)
+        # shared_with_groups changed
+        object_cache.invalidate_project(project_id)
         print(f"Project {project.name_with_namespace} shared with group {group.name}.")
+        return True
     except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
         print(f"Error sharing project with group: {e}")
+        return False
 
 # Unshare project with a  group
 @time_it
 def unshare_project_with_group(gl, project_id, group_id):
     try:
-        project = gl.projects.get(project_id)
-        group = gl.groups.get(group_id)
+        project = object_cache.get_project(gl, project_id)
+        group = object_cache.get_group(gl, group_id)
         project.unshare(group.id)
+        object_cache.invalidate_project(project_id)
         print(f"Project {project.name_with_namespace} unshared from group {group.name}.")
+        return True
     except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
         print(f"Error unsharing project with group: {e}")
+        return False
 
-### 7. Analytics
+# Project x group sharing matrix, loaded once and then updated locally
 @time_it
-def issue_completion_report(gl, project_id):
+def load_sharing_matrix(gl):
     try:
-        project = gl.projects.get(project_id)
-        closed_issues = project.issues.list(state='closed', all=True)
-
-        # Calculate total number of closed issues
-        total_closed_issues = len(closed_issues)
-        print(total_closed_issues)
-
-        total_duration = timedelta(days=0, hours=0)
-        # Calculate total duration for closed issues iteratively
-        for closed_issue in closed_issues:
-            closed_time = closed_issue.closed_at
-            created_time = closed_issue.created_at
-            created_time_no_z = created_time.removesuffix('Z')
-            closed_time_no_z = closed_time.removesuffix('Z')
-            created_time_obj = datetime.fromisoformat(created_time_no_z)
-            closed_time_obj = datetime.fromisoformat(closed_time_no_z)
-            duration = closed_time_obj - created_time_obj
-            print(f"  - #{closed_issue.iid}: {closed_issue.title} created at {closed_issue.created_at} and closed at {closed_issue.closed_at}, duration: {duration}")
-            total_duration += duration
-        print(f"Average duration to close a issue: {total_duration / total_closed_issues if total_closed_issues > 0 else 0}")
+        matrix = sharing.build_matrix(gl)
+        print(f"Sharing matrix loaded: {len(matrix)} projects x {len(matrix.group_ids)} groups.")
+        return matrix
     except gitlab.exceptions.GitlabError as e:
-        print(f"Error generating issue completion report: {e}")
+        metrics.record_error()
+        print(f"Error loading sharing matrix: {e}")
         return None
 
 @time_it
-def pipeline_successful_report(gl, project_id):
+def load_project_sharing(gl, matrix, project_id):
     try:
-        project = gl.projects.get(project_id)
-        pipelines = project.pipelines.list(get_all=True)
-        total_pipeline_run = len(pipelines)
-        total_successful_pipelines = 0
-
-        for pipeline in pipelines:
-            if pipeline.status == 'success':
-                total_successful_pipelines += 1
-
-        print(f"Pipeline run summary:")
-        print(f"Total pipelines: {total_pipeline_run}")
-        print(f"Successful pipelines: {total_successful_pipelines}")
-        print(f"Successful rate: {round(total_successful_pipelines/ total_pipeline_run * 100 if total_pipeline_run > 0 else 0, 1)}%")
+        sharing.load_project(gl, matrix, project_id)
+        return True
     except gitlab.exceptions.GitlabError as e:
-        print(f"Error generating pipeline successful report: {e}")
+        metrics.record_error()
+        print(f"Error retrieving project sharing: {e}")
+        return False
+
 @time_it
-def pipeline_run_time_report(gl, project_id):
+def verify_project_sharing(gl, matrix, project_id):
+    """Checks the local row of a project against the server (and corrects it)."""
     try:
-        project = gl.projects.get(project_id)
-        pipelines = project.pipelines.list(get_all=True)
-        total_pipeline_run = len(pipelines)
-        duration = timedelta(days=0, hours=0)
-        for partial_pipeline in pipelines:
-            full_pipeline = project.pipelines.get(partial_pipeline.id)
-            started_time_obj = full_pipeline.started_at
-            finished_time_obj = full_pipeline.finished_at
-            if started_time_obj and finished_time_obj:
-                started_time_no_z = started_time_obj.removesuffix('Z')
-                finished_time_no_z = finished_time_obj.removesuffix('Z')
-                started_time = datetime.fromisoformat(started_time_no_z)
-                finished_time = datetime.fromisoformat(finished_time_no_z)
-                duration += finished_time - started_time
-                print(f"Pipeline starts at {started_time} and ends at {finished_time}")
-        print(f"Average pipeline run time: {duration / total_pipeline_run if total_pipeline_run > 0 else 0}")
+        if sharing.verify_project(gl, matrix, project_id):
+            print(f"Sharing of project {project_id} verified.")
+            return True
+        print(f"⚠️ Sharing of project {project_id} differed from the server and was reloaded.")
+        return False
     except gitlab.exceptions.GitlabError as e:
-        print(f"Error generating pipeline run time report: {e}")
+        metrics.record_error()
+        print(f"Error verifying project sharing: {e}")
+        return None
 
-def main():
-    """Obtaining token from local env"""
-    load_dotenv()
-    private_token = os.environ.get("GITLAB_PRIVATE_TOKEN")
-    gitlab_url = os.environ.get("GITLAB_URL")
+# Hit rate of the group/project/member cache, to tune GITLAB_CACHE_TTL / GITLAB_CACHE_SIZE
+def cache_stats():
+    stats = object_cache.get_cache().stats()
+    hit_rate = f"{stats['hit_rate']:.0%}" if stats["hit_rate"] is not None else "n/a"
+    print(f"Object cache: {stats['hits']} hits, {stats['misses']} misses (hit rate {hit_rate}), "
+          f"{stats['entries']} entries, {stats['evictions']} evictions, {stats['invalidations']} invalidations.")
+    return stats
+
+# Revalidated (304) vs downloaded GET responses, to tune GITLAB_HTTP_CACHE_MB
+def http_cache_stats():
+    store = http_cache.get_store()
+    if store is None:
+        print("HTTP cache disabled.")
+        return None
+    stats = store.stats()
+    hit_rate = f"{stats['hit_rate']:.0%}" if stats["hit_rate"] is not None else "n/a"
+    print(f"HTTP cache: {stats['hits']} not modified, {stats['misses']} downloaded (hit rate {hit_rate}), "
+          f"{stats['entries']} responses in {stats['bytes'] / 1024:.1f} KB, {stats['evictions']} evictions, "
+          f"{stats['bytes_saved'] / 1024:.1f} KB not downloaded again.")
+    return stats
 
-    """Connects to GitLab and runs the report."""
-    try:
-        # This just creates the object; no API call is made yet.
-        gl = gitlab.Gitlab(gitlab_url, private_token=private_token)
+### 7. Analytics
+# Number of closed issues listed by the issue completion report
+RECENT_ISSUES_LISTED = 10
 
-        # This is the line that makes the API call to verify the token.
-        # It will throw a GitlabError if the token is invalid or lacks permissions.
-        gl.auth()
-        
-        print("Authentication successful! ✅")
+# The reports read from the local SQLite mirror, which is synced incrementally first
+@time_it
+def sync_project_data(gl, project_id, max_age=mirror.DEFAULT_MAX_AGE):
+    """Brings the local mirror of a project up to date, unless it was synced less than max_age seconds ago."""
+    local_mirror = mirror.get_mirror()
+    project_id = int(project_id)
+    if max_age and local_mirror.is_fresh(project_id, max_age):
+        return local_mirror
+    # lazy=True: only the sub-resources are requested, not the project itself
+    project = gl.projects.get(project_id, lazy=True)
+    # Bulk history downloads queue behind interactive requests
+    with scheduler.priority(scheduler.BULK):
+        synced = local_mirror.sync_project(project)
+    print(f"Synced {synced['pipelines']} pipelines and {synced['issues']} issues.")
+    return local_mirror
 
+@time_it
+def issue_completion_report(gl, project_id, max_age=mirror.DEFAULT_MAX_AGE):
+    try:
+        local_mirror = sync_project_data(gl, project_id, max_age=max_age)
+        # Durations are computed on int64 epoch columns in one vectorized pass
+        durations = columnar.load_issues(local_mirror, int(project_id)).time_to_close()
+        report = columnar.stats(durations)
+
+        print(f"Recently closed issues:")
+        for iid, title, created_at, closed_at in local_mirror.closed_issues(int(project_id), limit=RECENT_ISSUES_LISTED):
+            duration = fetch_engine.parse_timestamp(closed_at) - fetch_engine.parse_timestamp(created_at)
+            print(f"  - #{iid}: {title} created at {created_at} and closed at {closed_at}, duration: {duration}")
+        print(f"Closed issues: {report['count']}")
+        print(f"Average duration to close a issue: {format_seconds(report['average'])}")
+        print(f"p50: {format_seconds(report['p50'])}, p95: {format_seconds(report['p95'])}")
+        return {
+            "project_id": int(project_id),
+            "closed_issues": report["count"],
+            "average": report["average"],
+            "p50": report["p50"],
+            "p95": report["p95"],
+            "p99": report["p99"],
+        }
     except gitlab.exceptions.GitlabError as e:
-        print(f"Authentication failed: {e}")
-        # The script should exit here if authentication fails.
-        exit(1)
-
-    list_projects(gl)
-    project = get_project_by_id(gl, PROJECT_ID)
-
-    list_members_in_project(project)
-
-    # Test Group Creation
-    #create_group(gl, "Test Group", PARENT_GROUP_ID)
-
-    # Test User Addition
-    #add_user_to_group(gl, extra_member_user_id, 114130346, gitlab.const.AccessLevel.MAINTAINER)
-    #print(f"✅ User with ID {extra_member_user_id} added to group 114130346.")
+        metrics.record_error()
+        print(f"Error generating issue completion report: {e}")
+        return None
 
+@time_it
+def pipeline_successful_report(gl, project_id, max_age=mirror.DEFAULT_MAX_AGE):
+    try:
+        local_mirror = sync_project_data(gl, project_id, max_age=max_age)
+        status_counts = local_mirror.pipeline_status_counts(int(project_id))
+        total_pipeline_run = sum(status_counts.values())
+        total_successful_pipelines = status_counts.get('success', 0)
+        success_rate = round(total_successful_pipelines / total_pipeline_run * 100 if total_pipeline_run > 0 else 0, 1)
 
-    # Test User Removal
-    #remove_user_from_group(gl, extra_member_user_id, 114130346)
-    #print(f"✅ User with ID {extra_member_user_id} removed from group 114130346.")
+        print(f"Pipeline run summary:")
+        print(f"Total pipelines: {total_pipeline_run}")
+        print(f"Successful pipelines: {total_successful_pipelines}")
+        print(f"Successful rate: {success_rate}%")
+        return {
+            "project_id": int(project_id),
+            "total_pipelines": total_pipeline_run,
+            "successful_pipelines": total_successful_pipelines,
+            "success_rate": success_rate,
+        }
+    except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
+        print(f"Error generating pipeline successful report: {e}")
+        return None
 
-    # Test User Listing
-    #list_user_in_group(gl, 114130346)
+@time_it
+def pipeline_run_time_report(gl, project_id, max_age=mirror.DEFAULT_MAX_AGE):
+    """
+    Returns the pipeline run time statistics of a project as a dict:
+    total/timed pipeline counts, average, p50/p95/p99 (seconds), a per-ref breakdown
+    and a histogram, computed on the columnar (NumPy) copy of the mirrored pipelines.
+    Only the pipelines that changed since the last sync need their details fetched,
+    which is done with a bounded pool of parallel workers.
+    """
+    try:
+        local_mirror = sync_project_data(gl, project_id, max_age=max_age)
+        pipelines = columnar.load_pipelines(local_mirror, int(project_id))
+
+        report = pipelines.run_time_summary()
+        report["project_id"] = int(project_id)
+        report["total_pipelines"] = len(pipelines)
+        print_run_time_report(report)
+        return report
+    except gitlab.exceptions.GitlabError as e:
+        metrics.record_error()
+        print(f"Error generating pipeline run time report: {e}")
+        return None
 
-    # Test Project Listing
-    #ist_projects(gl)
+def format_seconds(seconds):
+    return timedelta(seconds=round(seconds)) if seconds is not None else "n/a"
 
-    #Test sharing project with group
-    try:
-        share_project_with_group(gl, PROJECT_ID, SUB_GROUP_ID)
-        print(f"✅ Project {PROJECT_ID} shared with group {SUB_GROUP_ID}.")
-    except Exception as e:
-        print(f"Error sharing project with group: {e}")
+def print_run_time_report(report):
+    fmt = format_seconds
+    print(f"Pipeline run time summary:")
+    print(f"Total pipelines: {report['total_pipelines']} ({report['count']} with timing data)")
+    print(f"Average pipeline run time: {fmt(report['average'])}")
+    print(f"p50: {fmt(report['p50'])}, p95: {fmt(report['p95'])}, p99: {fmt(report['p99'])}")
+    for ref, stats in report["by_ref"].items():
+        print(f"  - {ref}: {stats['count']} runs, average {fmt(stats['average'])}, p95 {fmt(stats['p95'])}")
 
-    # Test unsharing project with group
-    # unshare_project_with_group(gl, PROJECT_ID, SUB_GROUP_ID)
-    
-    # Test Project Retrieval
-    # project = get_project_by_id(gl, PROJECT_ID)
-    # if project:
-    #     get_project_summary(project)
+@time_it
+def portfolio_report(gl, top=portfolio.DEFAULT_TOP, max_workers=portfolio.DEFAULT_MAX_WORKERS, max_age=mirror.DEFAULT_MAX_AGE):
+    """Runs the three reports over every owned project in parallel and prints the ranked tables."""
+    results = portfolio.run_portfolio(gl, max_workers=max_workers, max_age=max_age)
+    rankings = portfolio.rank(results, top=top)
+
+    print(f"\n🐢 Slowest pipelines (p95 run time):")
+    for r in rankings["slowest_pipelines"]:
+        print(f"  - {r['name']}: p95 {format_seconds(r['p95_run_time'])}, average {format_seconds(r['average_run_time'])}")
+    print(f"\n📉 Lowest pipeline success rate:")
+    for r in rankings["lowest_success_rate"]:
+        print(f"  - {r['name']}: {r['success_rate']}% of {r['total_pipelines']} pipelines")
+    print(f"\n⏳ Oldest open issues:")
+    for r in rankings["oldest_open_issues"]:
+        issue = r["oldest_open_issue"]
+        print(f"  - {r['name']} #{issue['iid']}: {issue['title']} (open for {format_seconds(issue['age_seconds'])})")
+    if rankings["failed_projects"]:
+        print(f"\n❌ {len(rankings['failed_projects'])} projects could not be fully synced:")
+        for r in rankings["failed_projects"]:
+            print(f"  - {r['name']}: {r['error']}")
+    return {"projects": results, "rankings": rankings}
 
-    #pipeline_run_time_report(gl, PROJECT_ID)
-    create_project(gl, "Frontend_project5", FRONTEND_GROUP_ID)
+def main():
+    """Command-line entry point, see cli.py (python backend.py --help)."""
+    import cli
+    return cli.main()
 
 
-    # Standard Python entry point
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+Performance regression benchmarks for the backend operations, run offline against
+the fake GitLab server with seeded datasets of increasing size.
+
+    python benchmark.py run --output baseline.json
+    python benchmark.py run --output current.json --baseline baseline.json
+    python benchmark.py compare baseline.json current.json --threshold 0.25
+
+Each operation records wall time, HTTP requests, response bytes and peak Python
+memory (tracemalloc), plus the cold client and warm request times of the
+connection. The request count is deterministic, so any increase is flagged:
+that is how an N+1 pattern coming back shows up. Times, bytes and memory are
+flagged past the relative threshold.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import fake_gitlab
+import gitlab_client
+import http_cache
+import instrumentation
+import mirror
+import object_cache
+
+# Seeded datasets; the larger ones show how each operation scales
+SIZES = {
+    "small": dict(groups=5, projects_per_group=4, pipelines_per_project=20, issues_per_project=10, commits_per_project=10),
+    "medium": dict(groups=20, projects_per_group=10, pipelines_per_project=100, issues_per_project=50, commits_per_project=30),
+    "large": dict(groups=50, projects_per_group=20, pipelines_per_project=400, issues_per_project=200, commits_per_project=60),
+}
+# Default relative increase of time/bytes/memory reported as a regression
+DEFAULT_THRESHOLD = 0.25
+# Differences below these are noise, whatever the relative change
+MIN_SECONDS = 0.005
+MIN_BYTES = 64 * 1024
+# cold_client_seconds and warm_request_seconds come from the "connection" entry
+METRICS = ("wall_seconds", "requests", "bytes", "peak_memory_bytes", "cold_client_seconds", "warm_request_seconds")
+
+
+def measure(name, func, *args, **kwargs):
+    """Runs one operation and returns (result, {wall_seconds, requests, bytes, peak_memory_bytes})."""
+    tracemalloc.reset_peak()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start_time = time.perf_counter()
+    with instrumentation.scope(f"benchmark.{name}") as scope, contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    wall = time.perf_counter() - start_time
+    return result, {
+        "wall_seconds": wall,
+        "requests": scope.requests,
+        "bytes": scope.bytes,
+        "peak_memory_bytes": max(tracemalloc.get_traced_memory()[1] - start_memory, 0),
+    }
+
+
+def run_size(size, dataset, latency=0.0, seed=0):
+    """Seeds a fake server with the dataset and measures every operation once. Returns {operation: metrics}."""
+    data = fake_gitlab.FakeData().seed(seed=seed, **dataset)
+    server = fake_gitlab.start_server(data, latency=latency)
+    results = {}
+    # Removed on exit, once the finally below has closed the mirror and the response store
+    with tempfile.TemporaryDirectory(prefix=f"benchmark-{size}-") as workdir:
+        os.environ.update(GITLAB_URL=server.url, GITLAB_PRIVATE_TOKEN="benchmark",
+                          GITLAB_MIRROR_PATH=os.path.join(workdir, "mirror.db"),
+                          GITLAB_HTTP_CACHE_PATH=os.path.join(workdir, "http_cache.db"))
+        gitlab_client.reset_client()
+        http_cache.reset_store()
+        mirror.reset_mirror()
+        object_cache.get_cache().clear()
+        try:
+            _run_operations(size, data, results)
+        finally:
+            server.shutdown()
+            server.server_close()
+            mirror.reset_mirror()
+            gitlab_client.reset_client()
+            http_cache.reset_store()
+    return results
+
+
+def _run_operations(size, data, results):
+    """Measures the connection and then each backend operation into results."""
+    import backend
+
+    results["connection"] = {name: value for name, value in gitlab_client.measure_latency().items()
+                             if name.endswith("_seconds")}
+    gl = gitlab_client.get_client()
+    project_id = min(data.projects)
+    group_id = next(g for g in data.groups if g != data.projects[project_id]["namespace"]["id"])
+
+    def step(name, func, *args, **kwargs):
+        result, results[name] = measure(name, func, *args, **kwargs)
+        return result
+
+    step("list_groups", backend.list_groups, gl)
+    step("list_projects", backend.list_projects, gl)
+    step("load_catalog", backend.load_catalog, gl)
+    project = gl.projects.get(project_id)
+    step("get_project_summary", backend.get_project_summary, project)
+    # Cold sync first, then the reports with max_age=0: each one runs an incremental sync
+    step("sync_project_data", backend.sync_project_data, gl, project_id, max_age=0)
+    step("issue_completion_report", backend.issue_completion_report, gl, project_id, max_age=0)
+    step("pipeline_successful_report", backend.pipeline_successful_report, gl, project_id, max_age=0)
+    step("pipeline_run_time_report", backend.pipeline_run_time_report, gl, project_id, max_age=0)
+    step("share_project_with_group", backend.share_project_with_group, gl, project_id, group_id)
+    step("unshare_project_with_group", backend.unshare_project_with_group, gl, project_id, group_id)
+    step("create_project", backend.create_project, gl, f"benchmark-{size}", group_id)
+
+
+def run(sizes=tuple(SIZES), latency=0.0, seed=0):
+    tracemalloc.start()
+    try:
+        # The template files are read relative to the repository root
+        with contextlib.chdir(os.path.dirname(os.path.abspath(__file__))):
+            results = {}
+            for size in sizes:
+                print(f"Running '{size}' dataset...", file=sys.stderr)
+                results[size] = run_size(size, SIZES[size], latency=latency, seed=seed)
+    finally:
+        tracemalloc.stop()
+    return {
+        "meta": {"created_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+                 "platform": platform.platform(), "latency": latency, "seed": seed},
+        "datasets": {size: SIZES[size] for size in sizes},
+        "results": results,
+    }
+
+
+# --- Comparison ---
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Returns the regressions of current against baseline, as a list of
+    {size, operation, metric, baseline, current, change}. Any extra request counts;
+    the other metrics must grow by more than the threshold (and the noise floor).
+    """
+    regressions = []
+    for size, operations in current["results"].items():
+        for operation, metrics in operations.items():
+            before = baseline["results"].get(size, {}).get(operation)
+            if not before:
+                continue
+            for metric in METRICS:
+                if metric not in metrics or metric not in before:
+                    continue
+                old, new = before[metric], metrics[metric]
+                if metric == "requests":
+                    regressed = new > old
+                else:
+                    floor = MIN_SECONDS if metric.endswith("_seconds") else MIN_BYTES
+                    regressed = new - old > floor and new > old * (1 + threshold)
+                if regressed:
+                    regressions.append({"size": size, "operation": operation, "metric": metric, "baseline": old,
+                                        "current": new, "change": (new - old) / old if old else None})
+    return regressions
+
+
+def print_results(report):
+    for size, operations in report["results"].items():
+        print(f"\n=== {size} ({', '.join(f'{k}={v}' for k, v in report['datasets'][size].items())}) ===")
+        print(f"{'operation':<30}{'wall (s)':>10}{'requests':>10}{'KB':>10}{'peak mem KB':>13}")
+        for operation, metrics in operations.items():
+            if operation == "connection":
+                print(f"{'connection':<30} cold client {metrics['cold_client_seconds']:.3f}s, "
+                      f"warm request {metrics['warm_request_seconds']:.4f}s")
+                continue
+            print(f"{operation:<30}{metrics['wall_seconds']:>10.3f}{metrics['requests']:>10}"
+                  f"{metrics['bytes'] / 1024:>10.1f}{metrics['peak_memory_bytes'] / 1024:>13.1f}")
+
+
+def print_regressions(regressions, threshold):
+    if not regressions:
+        print(f"\n✅ No regressions (threshold {threshold:.0%}, any extra request).")
+        return
+    print(f"\n❌ {len(regressions)} regressions:")
+    for r in regressions:
+        change = f"{r['change']:+.0%}" if r["change"] is not None else "new"
+        print(f"  - [{r['size']}] {r['operation']} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} ({change})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backend performance benchmarks against the fake GitLab server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--sizes", nargs="+", choices=tuple(SIZES), default=list(SIZES))
+    run_parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake server adds to each response")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--output", help="write the results (a new baseline) to this JSON file")
+    run_parser.add_argument("--baseline", help="compare against this JSON baseline")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run(args.sizes, latency=args.latency, seed=args.seed)
+        print_results(report)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nResults written to {args.output}")
+        if not args.baseline:
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            report = json.load(f)
+
+    regressions = compare(baseline, report, threshold=args.threshold)
+    print_regressions(regressions, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
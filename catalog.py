@@ -0,0 +1,111 @@
+import streaming
+
+
+class Catalog:
+    """
+    In-memory group -> project tree of the account.
+    Groups can be looked up by id, by full namespace path and by parent group;
+    projects by id and by the group (namespace) they live in.
+    """
+    def __init__(self):
+        self.groups = {}               # group id -> group record
+        self.groups_by_path = {}       # full_path -> group id
+        self.children_by_parent = {}   # parent id (None for top-level) -> [group id]
+        self.projects = {}             # project id -> project record
+        self.projects_by_group = {}    # namespace id -> [project id]
+
+    # --- Loading ---
+    def add_group(self, group):
+        return self.add_group_record({
+            "id": group.id,
+            "name": group.name,
+            "full_path": group.full_path,
+            "parent_id": group.parent_id,
+        })
+
+    def add_group_record(self, record):
+        group_id = record["id"]
+        self.groups[group_id] = record
+        self.groups_by_path[record["full_path"]] = group_id
+        siblings = self.children_by_parent.setdefault(record["parent_id"], [])
+        if group_id not in siblings:
+            siblings.append(group_id)
+        self.projects_by_group.setdefault(group_id, [])
+        return record
+
+    def add_project(self, project):
+        return self.add_project_record({
+            "id": project.id,
+            "name": project.name,
+            "name_with_namespace": project.name_with_namespace,
+            "path_with_namespace": project.path_with_namespace,
+            "namespace_id": project.namespace["id"],
+        })
+
+    def add_project_record(self, record):
+        self.projects[record["id"]] = record
+        group_projects = self.projects_by_group.setdefault(record["namespace_id"], [])
+        if record["id"] not in group_projects:
+            group_projects.append(record["id"])
+        return record
+
+    # --- Persistence (plain records, e.g. for the startup snapshot) ---
+    def to_dict(self):
+        return {"groups": list(self.groups.values()), "projects": list(self.projects.values())}
+
+    @classmethod
+    def from_dict(cls, data):
+        catalog = cls()
+        for record in data.get("groups", []):
+            catalog.add_group_record(record)
+        for record in data.get("projects", []):
+            catalog.add_project_record(record)
+        return catalog
+
+    # --- Lookups ---
+    def get_group(self, group_id):
+        return self.groups.get(int(group_id))
+
+    def get_group_by_path(self, full_path):
+        group_id = self.groups_by_path.get(full_path)
+        return self.groups.get(group_id) if group_id is not None else None
+
+    def children(self, parent_id):
+        """Returns the direct subgroups of a group (parent_id=None for top-level groups)."""
+        parent_id = int(parent_id) if parent_id is not None else None
+        return [self.groups[group_id] for group_id in self.children_by_parent.get(parent_id, [])]
+
+    def get_project(self, project_id):
+        return self.projects.get(int(project_id))
+
+    def projects_in_group(self, group_id):
+        return [self.projects[project_id] for project_id in self.projects_by_group.get(int(group_id), [])]
+
+    # --- Views for the UI panels ---
+    def group_options(self):
+        """Returns {group_id: {"name": ..., "full_path": ..., "projects": [{project_id: name}, ...]}} for the owned groups."""
+        return {
+            group_id: {
+                "name": group["name"],
+                "full_path": group["full_path"],
+                "projects": [{project["id"]: project["name"]} for project in self.projects_in_group(group_id)],
+            }
+            for group_id, group in self.groups.items()
+        }
+
+
+def build_catalog(gl):
+    """
+    Builds the catalog with two paginated listings: the owned groups and the
+    projects the account is a member of, which are mapped onto the groups by namespace.
+    A failing page raises (GitlabError or a requests exception) rather than
+    returning a truncated catalog that would look complete.
+    """
+    catalog = Catalog()
+    for group in streaming.iter_groups(gl, owned=True):
+        catalog.add_group(group)
+    for project in streaming.iter_projects(gl, membership=True):
+        # Only keep projects that live in one of the owned groups
+        if project.namespace["id"] in catalog.groups:
+            catalog.add_project(project)
+    return catalog
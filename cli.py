@@ -0,0 +1,199 @@
+"""
+Headless command-line interface over the backend, for cron jobs and CI runners.
+
+    python cli.py [--format json|ndjson] <command> [options]
+
+Results go to stdout as JSON (one document) or NDJSON (one record per line);
+the backend's progress messages go to stderr. No UI code is loaded, and modules
+are imported per command so e.g. a listing never loads the analytics stack.
+Exit status is 0 on success, 1 when the command failed.
+"""
+import argparse
+import contextlib
+import json
+import sys
+
+
+# --- Output ---
+def to_jsonable(value):
+    """json.dumps default: GitLab objects, namedtuples, sets and exceptions."""
+    if hasattr(value, "asdict"):
+        return value.asdict()
+    if hasattr(value, "_asdict"):
+        return value._asdict()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, BaseException):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def emit(records, output_format, out=None):
+    """Writes records (a list/iterator, or a single dict) as one JSON document or as NDJSON lines."""
+    out = out or sys.stdout
+    if output_format == "ndjson":
+        for record in ([records] if isinstance(records, dict) else records):
+            out.write(json.dumps(record, default=to_jsonable) + "\n")
+            out.flush()
+    else:
+        if not isinstance(records, dict):
+            records = list(records)
+        json.dump(records, out, default=to_jsonable, indent=2)
+        out.write("\n")
+
+def _project_record(project):
+    if project is None:
+        return None
+    return {"id": project.id, "name_with_namespace": project.name_with_namespace}
+
+def _given(**options):
+    """Only the options set on the command line, so the backend defaults apply to the rest."""
+    return {name: value for name, value in options.items() if value is not None}
+
+def _connect():
+    import gitlab
+    import gitlab_client
+    try:
+        return gitlab_client.get_client()
+    except gitlab.exceptions.GitlabError as e:
+        print(f"Authentication failed: {e}", file=sys.stderr)
+        return None
+
+
+# --- Commands ---
+# Each returns what is emitted, or None on failure
+def cmd_projects(gl, args):
+    import streaming
+    return ({"id": p.id, "name_with_namespace": p.name_with_namespace, "default_branch": getattr(p, "default_branch", None)}
+            for p in streaming.iter_projects(gl, owned=True))
+
+def cmd_groups(gl, args):
+    import streaming
+    return ({"id": g.id, "name": g.name, "full_path": g.full_path, "parent_id": g.parent_id}
+            for g in streaming.iter_groups(gl, owned=True))
+
+def cmd_report(gl, args):
+    import backend
+    reports = {
+        "issues": backend.issue_completion_report,
+        "pipelines": backend.pipeline_successful_report,
+        "run-time": backend.pipeline_run_time_report,
+    }
+    return reports[args.report](gl, args.project_id, **_given(max_age=args.max_age))
+
+def cmd_portfolio(gl, args):
+    import backend
+    result = backend.portfolio_report(gl, **_given(top=args.top, max_workers=args.workers, max_age=args.max_age))
+    if args.format == "ndjson":
+        return iter(result["projects"].values())
+    return {"projects": list(result["projects"].values()), "rankings": result["rankings"]}
+
+def cmd_provision(gl, args):
+    import backend
+    results = backend.provision_projects_from_manifest(gl, args.manifest, default_group=args.group,
+                                                       **_given(max_workers=args.workers))
+    if results is None:
+        return None
+    return [dict(r, project=_project_record(r["project"])) for r in results]
+
+def cmd_template_sync(gl, args):
+    import backend
+    results = backend.sync_template_fleet(gl, dry_run=args.dry_run, **_given(max_workers=args.workers))
+    return list(results.values()) if results is not None else None
+
+def cmd_membership(gl, args):
+    import backend
+    result = backend.apply_membership_file(gl, args.file, prune=args.prune, dry_run=args.dry_run)
+    if result is None:
+        return None
+    errors = [dict(op._asdict(), error=str(e)) for op, e in result["errors"].items()]
+    return {"operations": result["operations"], "applied": result["applied"], "errors": errors}
+
+def cmd_sharing(gl, args):
+    import backend
+    import sharing
+    matrix = sharing.SharingMatrix()
+    if not backend.load_project_sharing(gl, matrix, args.project_id):
+        return None
+    return {"project_id": int(args.project_id),
+            "shared_with": [{"group_id": gid, "group_name": name} for gid, name in matrix.shared_groups(args.project_id)]}
+
+def cmd_share(gl, args):
+    import backend
+    share = backend.share_project_with_group if args.command == "share" else backend.unshare_project_with_group
+    ok = share(gl, args.project_id, args.group_id)
+    return {"project_id": int(args.project_id), "group_id": int(args.group_id), "shared": args.command == "share"} if ok else None
+
+def cmd_latency(gl, args):
+    import gitlab_client
+    return gitlab_client.measure_latency(repeat=args.repeat)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Headless GitLab backend commands.")
+    parser.add_argument("--format", choices=("json", "ndjson"), default="json", help="output format (default: json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("projects", help="list the owned projects").set_defaults(func=cmd_projects)
+    commands.add_parser("groups", help="list the owned groups").set_defaults(func=cmd_groups)
+
+    report = commands.add_parser("report", help="run one analytics report for a project")
+    report.add_argument("report", choices=("issues", "pipelines", "run-time"))
+    report.add_argument("project_id")
+    report.add_argument("--max-age", type=int, help="seconds a mirror sync stays fresh (0 = always sync)")
+    report.set_defaults(func=cmd_report)
+
+    portfolio = commands.add_parser("portfolio", help="run the reports across all owned projects")
+    portfolio.add_argument("--top", type=int, help="rows per ranked table")
+    portfolio.add_argument("--workers", type=int, help="projects analysed at the same time")
+    portfolio.add_argument("--max-age", type=int, help="seconds a mirror sync stays fresh (0 = always sync)")
+    portfolio.set_defaults(func=cmd_portfolio)
+
+    provision = commands.add_parser("provision", help="create projects from a CSV/YAML manifest")
+    provision.add_argument("manifest")
+    provision.add_argument("--group", help="group for the entries that do not name one")
+    provision.add_argument("--workers", type=int, help="projects created at the same time")
+    provision.set_defaults(func=cmd_provision)
+
+    template_sync = commands.add_parser("template-sync", help="push the template to projects whose files differ")
+    template_sync.add_argument("--dry-run", action="store_true")
+    template_sync.add_argument("--workers", type=int, help="projects checked at the same time")
+    template_sync.set_defaults(func=cmd_template_sync)
+
+    membership = commands.add_parser("membership", help="apply a CSV/YAML desired-state membership file")
+    membership.add_argument("file")
+    membership.add_argument("--prune", action="store_true", help="remove members missing from the file (never owners)")
+    membership.add_argument("--dry-run", action="store_true")
+    membership.set_defaults(func=cmd_membership)
+
+    show = commands.add_parser("sharing", help="show the groups a project is shared with")
+    show.add_argument("project_id")
+    show.set_defaults(func=cmd_sharing)
+    for name in ("share", "unshare"):
+        command = commands.add_parser(name, help=f"{name} a project with a group")
+        command.add_argument("project_id")
+        command.add_argument("group_id")
+        command.set_defaults(func=cmd_share)
+
+    latency = commands.add_parser("latency", help="measure cold/warm client and request latency")
+    latency.add_argument("--repeat", type=int, default=5)
+    latency.set_defaults(func=cmd_latency)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    # Everything the backend prints is a log line, not output
+    with contextlib.redirect_stdout(sys.stderr):
+        gl = _connect()
+        if gl is None:
+            return 1
+        result = args.func(gl, args)
+        if result is None:
+            return 1
+        emit(result, args.format, out=out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
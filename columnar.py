@@ -0,0 +1,183 @@
+import collections
+import threading
+
+import numpy as np
+
+# Epoch value stored for a missing timestamp (e.g. a pipeline that never started)
+MISSING = np.iinfo(np.int64).min
+# Number of bins in the duration histogram of the reports
+HISTOGRAM_BINS = 20
+# Column sets kept in memory before the least recently used one is dropped
+MAX_LOADED = 32
+
+
+def epoch_ms_sql(column):
+    """SQLite expression turning an ISO 8601 column into epoch milliseconds (NULL stays NULL)."""
+    return f"CAST(ROUND((julianday({column}) - 2440587.5) * 86400000) AS INTEGER)"
+
+
+class Categorical:
+    """Column of repeated strings stored as int32 codes plus the list of distinct values."""
+    def __init__(self, values):
+        index = {}
+        self.codes = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                                 dtype=np.int32, count=len(values))
+        self.categories = list(index)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def mask(self, value):
+        """Boolean mask of the rows equal to value."""
+        if value not in self.categories:
+            return np.zeros(len(self.codes), dtype=bool)
+        return self.codes == self.categories.index(value)
+
+    def counts(self):
+        """Returns {value: number of rows}."""
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        return {value: int(count) for value, count in zip(self.categories, counts)}
+
+
+# --- Vectorized aggregates ---
+def stats(values):
+    """count, average and p50/p95/p99 of an array (same shape as fetch_engine.duration_stats)."""
+    if len(values) == 0:
+        return {"count": 0, "average": None, "p50": None, "p95": None, "p99": None}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": int(len(values)),
+        "average": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+    }
+
+def grouped_stats(codes, values, categories):
+    """stats() per category: the rows are sorted by code once and split into groups."""
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    sorted_values = values[order]
+    present = np.unique(sorted_codes)
+    bounds = np.searchsorted(sorted_codes, present, side="left").tolist() + [len(sorted_codes)]
+    groups = {categories[code]: stats(sorted_values[bounds[i]:bounds[i + 1]])
+              for i, code in enumerate(present.tolist())}
+    return dict(sorted(groups.items()))
+
+def histogram(values, bins=HISTOGRAM_BINS):
+    if len(values) == 0:
+        return {"edges": [], "counts": []}
+    counts, edges = np.histogram(values, bins=bins)
+    return {"edges": edges.tolist(), "counts": counts.tolist()}
+
+def rolling_mean(timestamps_ms, values, window_seconds):
+    """
+    Mean of the values in the trailing time window ending at each timestamp.
+    Returns (sorted timestamps, rolling means), computed from cumulative sums.
+    """
+    order = np.argsort(timestamps_ms, kind="stable")
+    times = timestamps_ms[order]
+    ordered = values[order].astype(np.float64)
+    cumulative = np.concatenate(([0.0], np.cumsum(ordered)))
+    starts = np.searchsorted(times, times - int(window_seconds * 1000), side="left")
+    ends = np.arange(1, len(times) + 1)
+    return times, (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+class PipelineColumns:
+    """Pipelines of a project as columns: int64 epoch-ms timestamps and categorical status/ref."""
+    def __init__(self, ids, created, started, finished, statuses, refs):
+        self.ids = ids
+        self.created = created
+        self.started = started
+        self.finished = finished
+        self.status = Categorical(statuses)
+        self.ref = Categorical(refs)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def timed(self):
+        """Mask of the pipelines that have both started_at and finished_at."""
+        return (self.started != MISSING) & (self.finished != MISSING)
+
+    def durations(self):
+        """Run time in seconds of the timed pipelines."""
+        mask = self.timed()
+        return (self.finished[mask] - self.started[mask]) / 1000.0
+
+    def success_rate(self):
+        return float(self.status.mask("success").mean() * 100) if len(self) else 0.0
+
+    def run_time_summary(self, bins=HISTOGRAM_BINS):
+        """Overall and per-ref run time statistics plus a histogram, in seconds."""
+        durations = self.durations()
+        summary = stats(durations)
+        summary["by_ref"] = grouped_stats(self.ref.codes[self.timed()], durations, self.ref.categories)
+        summary["histogram"] = histogram(durations, bins=bins)
+        return summary
+
+    def rolling_run_time(self, window_seconds):
+        """Trailing-window average run time at each pipeline's finish time."""
+        return rolling_mean(self.finished[self.timed()], self.durations(), window_seconds)
+
+
+class IssueColumns:
+    """Issues of a project as columns: int64 epoch-ms timestamps and categorical state."""
+    def __init__(self, iids, created, closed, states):
+        self.iids = iids
+        self.created = created
+        self.closed = closed
+        self.state = Categorical(states)
+
+    def __len__(self):
+        return len(self.iids)
+
+    def time_to_close(self):
+        """Seconds between creation and closing of the closed issues."""
+        mask = self.state.mask("closed") & (self.closed != MISSING)
+        return (self.closed[mask] - self.created[mask]) / 1000.0
+
+
+# --- Loading from the local mirror ---
+# Columns already built, keyed by (table, mirror path, project id) -> (mirror version, columns), oldest first.
+# Parsing the timestamps is the expensive part, so it only happens again after a sync wrote rows.
+_loaded = collections.OrderedDict()
+_loaded_lock = threading.Lock()
+
+def _int_column(rows, index):
+    return np.fromiter((MISSING if row[index] is None else row[index] for row in rows), dtype=np.int64, count=len(rows))
+
+def _cached(kind, local_mirror, project_id, build):
+    key = (kind, local_mirror.path, project_id)
+    version = local_mirror.version(project_id)
+    with _loaded_lock:
+        cached = _loaded.get(key)
+        if cached and cached[0] == version:
+            _loaded.move_to_end(key)
+            return cached[1]
+    columns = build()
+    with _loaded_lock:
+        _loaded[key] = (version, columns)
+        _loaded.move_to_end(key)
+        while len(_loaded) > MAX_LOADED:
+            _loaded.popitem(last=False)
+    return columns
+
+def load_pipelines(local_mirror, project_id):
+    def build():
+        rows = local_mirror.fetch_all(
+            f"SELECT id, {epoch_ms_sql('created_at')}, {epoch_ms_sql('started_at')}, {epoch_ms_sql('finished_at')}, "
+            "status, ref FROM pipelines WHERE project_id = ? ORDER BY id", (project_id,))
+        return PipelineColumns(
+            _int_column(rows, 0), _int_column(rows, 1), _int_column(rows, 2), _int_column(rows, 3),
+            [row[4] for row in rows], [row[5] for row in rows])
+    return _cached("pipelines", local_mirror, project_id, build)
+
+def load_issues(local_mirror, project_id):
+    def build():
+        rows = local_mirror.fetch_all(
+            f"SELECT iid, {epoch_ms_sql('created_at')}, {epoch_ms_sql('closed_at')}, state "
+            "FROM issues WHERE project_id = ? ORDER BY iid", (project_id,))
+        return IssueColumns(_int_column(rows, 0), _int_column(rows, 1), _int_column(rows, 2), [row[3] for row in rows])
+    return _cached("issues", local_mirror, project_id, build)
@@ -0,0 +1,702 @@
+"""
+Local stand-in for the GitLab REST API (v4), for offline testing and load benchmarks.
+
+    python fake_gitlab.py --port 8080 --groups 100 --projects-per-group 30
+    GITLAB_URL=http://127.0.0.1:8080 GITLAB_PRIVATE_TOKEN=fake python cli.py projects
+
+It serves the endpoints the backend uses from seeded synthetic data, paginates like
+GitLab (offset pages with X-Total*/Link headers, keyset pages with a Link header),
+sends RateLimit-* headers (429 + Retry-After once the window is used up) and can add
+latency and inject server errors. Only the standard library is needed.
+"""
+import argparse
+import base64
+import collections
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+import instrumentation
+
+API_PREFIX = "/api/v4"
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+PIPELINE_STATUSES = ("success", "success", "success", "failed", "canceled", "skipped", "running", "pending")
+FINISHED_STATUSES = {"success", "failed", "canceled", "skipped"}
+OWNER = 50
+
+
+def timestamp(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+def git_blob_sha(content):
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# --- Data ---
+class FakeData:
+    """In-memory GitLab state. All access goes through the lock, handlers run in many threads."""
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.ids = itertools.count(1000)
+        self.users = {1: {"id": 1, "username": "root", "name": "Fake Admin", "state": "active"}}
+        self.current_user = 1
+        self.groups = {}
+        self.projects = {}
+        self.group_members = collections.defaultdict(dict)     # group id -> {user id: access level}
+        self.project_members = collections.defaultdict(dict)   # project id -> {user id: access level}
+        self.variables = collections.defaultdict(dict)         # group id -> {key: value}
+        self.pipelines = collections.defaultdict(list)         # project id -> [pipeline]
+        self.issues = collections.defaultdict(list)
+        self.commits = collections.defaultdict(list)           # newest first
+        self.files = collections.defaultdict(dict)             # project id -> {path: content}
+        self.tags = collections.defaultdict(dict)
+        self.protected_tags = collections.defaultdict(dict)
+
+    def next_id(self):
+        return next(self.ids)
+
+    # --- Creation ---
+    def add_user(self, username):
+        user_id = self.next_id()
+        self.users[user_id] = {"id": user_id, "username": username, "name": username.title(), "state": "active"}
+        return self.users[user_id]
+
+    def add_group(self, name, path, parent_id=None):
+        parent = self.groups.get(parent_id) if parent_id else None
+        full_path = f"{parent['full_path']}/{path}" if parent else path
+        if any(g["full_path"] == full_path for g in self.groups.values()):
+            raise ApiError(400, {"path": ["has already been taken"]})
+        group_id = self.next_id()
+        self.groups[group_id] = {
+            "id": group_id, "name": name, "path": path, "full_path": full_path,
+            "full_name": f"{parent['full_name']} / {name}" if parent else name,
+            "parent_id": parent_id, "visibility": "private", "web_url": f"http://fake/groups/{full_path}",
+        }
+        self.group_members[group_id][self.current_user] = OWNER
+        return self.groups[group_id]
+
+    def add_project(self, name, namespace_id, initialize_with_readme=True):
+        group = self.groups.get(int(namespace_id))
+        if group is None:
+            raise ApiError(404, "404 Namespace Not Found")
+        path = re.sub(r"[^a-zA-Z0-9_.-]+", "-", name).lower()
+        if any(p["path"] == path and p["namespace"]["id"] == group["id"] for p in self.projects.values()):
+            raise ApiError(400, {"name": ["has already been taken"], "path": ["has already been taken"]})
+        project_id = self.next_id()
+        self.projects[project_id] = {
+            "id": project_id, "name": name, "path": path,
+            "name_with_namespace": f"{group['full_name']} / {name}",
+            "path_with_namespace": f"{group['full_path']}/{path}",
+            "namespace": {"id": group["id"], "name": group["name"], "path": group["path"],
+                          "kind": "group", "full_path": group["full_path"]},
+            "default_branch": "main", "visibility": "private", "shared_with_groups": [],
+            "created_at": timestamp(datetime.now(timezone.utc)),
+            "web_url": f"http://fake/{group['full_path']}/{path}",
+        }
+        if initialize_with_readme:
+            self.files[project_id]["README.md"] = f"# {name}\n"
+            self.add_commit(project_id, "Initial commit", datetime.now(timezone.utc))
+        return self.projects[project_id]
+
+    def add_commit(self, project_id, title, moment, author="Fake Admin"):
+        sha = hashlib.sha1(f"{project_id}-{len(self.commits[project_id])}-{title}".encode()).hexdigest()
+        commit = {"id": sha, "short_id": sha[:8], "title": title, "message": title, "author_name": author,
+                  "authored_date": timestamp(moment), "committed_date": timestamp(moment), "created_at": timestamp(moment)}
+        self.commits[project_id].insert(0, commit)
+        return commit
+
+    # --- Seeding ---
+    def seed(self, groups=20, projects_per_group=10, pipelines_per_project=50, issues_per_project=30,
+             commits_per_project=20, members_per_group=5, users=50, days=90, seed=0):
+        """Fills the store with deterministic synthetic data (same seed, same data)."""
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc)
+        user_ids = [self.add_user(f"user{i}")["id"] for i in range(users)]
+        top_level = []
+        with self.lock:
+            for g in range(groups):
+                parent_id = rng.choice(top_level) if top_level and g % 2 else None
+                group = self.add_group(f"Group {g}", f"group-{g}", parent_id)
+                if parent_id is None:
+                    top_level.append(group["id"])
+                for user_id in rng.sample(user_ids, min(members_per_group, len(user_ids))):
+                    self.group_members[group["id"]][user_id] = rng.choice((10, 20, 30, 40))
+                for p in range(projects_per_group):
+                    project = self.add_project(f"project-{g}-{p}", group["id"], initialize_with_readme=True)
+                    self._seed_project(rng, project["id"], now, days, pipelines_per_project,
+                                       issues_per_project, commits_per_project)
+        return self
+
+    def _seed_project(self, rng, project_id, now, days, pipelines, issues, commits):
+        span = timedelta(days=days).total_seconds()
+        refs = ("main", "main", "develop", "feature/a", "feature/b")
+        for i in range(pipelines):
+            created = now - timedelta(seconds=span * (1 - i / max(pipelines, 1)))
+            status = rng.choice(PIPELINE_STATUSES)
+            started = created + timedelta(seconds=rng.randint(1, 60))
+            duration = rng.randint(60, 1800)
+            finished = started + timedelta(seconds=duration) if status in FINISHED_STATUSES else None
+            self.pipelines[project_id].append({
+                "id": self.next_id(), "iid": i + 1, "project_id": project_id, "status": status,
+                "ref": rng.choice(refs), "sha": hashlib.sha1(f"{project_id}-{i}".encode()).hexdigest(),
+                "source": "push", "created_at": timestamp(created),
+                "updated_at": timestamp(finished or started),
+                "started_at": timestamp(started), "finished_at": timestamp(finished) if finished else None,
+                "duration": duration if finished else None,
+            })
+        for i in range(issues):
+            created = now - timedelta(seconds=span * rng.random())
+            closed = created + timedelta(hours=rng.randint(1, 24 * 30)) if rng.random() < 0.6 else None
+            if closed and closed > now:
+                closed = None
+            self.issues[project_id].append({
+                "id": self.next_id(), "iid": i + 1, "project_id": project_id, "title": f"Issue {i + 1}",
+                "state": "closed" if closed else "opened", "created_at": timestamp(created),
+                "updated_at": timestamp(closed or created), "closed_at": timestamp(closed) if closed else None,
+            })
+        for i in range(commits):
+            self.add_commit(project_id, f"Change {i + 1}", now - timedelta(seconds=span * (1 - i / max(commits, 1))))
+
+
+# --- Pagination ---
+def paginate(handler, records, query):
+    """Offset pages (X-Page, X-Total, Link...) or, with pagination=keyset, Link-only keyset pages."""
+    per_page = min(int(query.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+    order_by = query.get("order_by")
+    descending = query.get("sort", "desc" if order_by != "name" else "asc") == "desc"
+    if order_by in ("id", "name", "updated_at", "created_at", "path"):
+        records = sorted(records, key=lambda r: (r.get(order_by) or "", r["id"]) if order_by != "id" else r["id"],
+                         reverse=descending)
+    base = f"http://{handler.headers.get('Host')}{handler.path.split('?')[0]}"
+
+    if query.get("pagination") == "keyset":
+        # Like GitLab, id keysets continue below the last id when descending (the default), above it when ascending
+        if "id_before" in query:
+            start = next((i for i, r in enumerate(records) if r["id"] < int(query["id_before"])), len(records))
+        elif "id_after" in query:
+            start = next((i for i, r in enumerate(records) if r["id"] > int(query["id_after"])), len(records))
+        elif "cursor" in query:
+            start = int(base64.urlsafe_b64decode(query["cursor"]).decode())
+        else:
+            start = 0
+        page = records[start:start + per_page]
+        if start + per_page < len(records):
+            following = {k: v for k, v in query.items() if k not in ("id_before", "id_after", "cursor")}
+            if order_by == "id":
+                following["id_before" if descending else "id_after"] = page[-1]["id"]
+            else:
+                following["cursor"] = base64.urlsafe_b64encode(str(start + per_page).encode()).decode()
+            handler.extra_headers["Link"] = f'<{base}?{urlencode(following)}>; rel="next"'
+        return page
+
+    page_number = max(int(query.get("page", 1)), 1)
+    total_pages = max((len(records) + per_page - 1) // per_page, 1)
+    page = records[(page_number - 1) * per_page:page_number * per_page]
+    link = lambda number: f"<{base}?{urlencode(dict(query, page=number, per_page=per_page))}>"
+    links = [f'{link(1)}; rel="first"', f'{link(total_pages)}; rel="last"']
+    headers = {"X-Page": page_number, "X-Per-Page": per_page, "X-Total": len(records), "X-Total-Pages": total_pages,
+               "X-Next-Page": page_number + 1 if page_number < total_pages else "",
+               "X-Prev-Page": page_number - 1 if page_number > 1 else ""}
+    if page_number < total_pages:
+        links.insert(0, f'{link(page_number + 1)}; rel="next"')
+    if page_number > 1:
+        links.insert(0, f'{link(page_number - 1)}; rel="prev"')
+    handler.extra_headers.update({k: str(v) for k, v in headers.items()})
+    handler.extra_headers["Link"] = ", ".join(links)
+    return page
+
+
+# --- Rate limiting ---
+class RateLimiter:
+    """Fixed window of `limit` requests per `window` seconds, reported the way GitLab.com does."""
+    def __init__(self, limit=0, window=60):
+        self.limit = limit
+        self.window = window
+        self.lock = threading.Lock()
+        self.window_start = time.time()
+        self.used = 0
+
+    def check(self):
+        """Returns (allowed, headers)."""
+        if not self.limit:
+            return True, {}
+        with self.lock:
+            now = time.time()
+            if now - self.window_start >= self.window:
+                self.window_start = now
+                self.used = 0
+            self.used += 1
+            reset = self.window_start + self.window
+            headers = {"RateLimit-Limit": str(self.limit), "RateLimit-Observed": str(self.used),
+                       "RateLimit-Remaining": str(max(self.limit - self.used, 0)), "RateLimit-Reset": str(int(reset))}
+            if self.used > self.limit:
+                headers["Retry-After"] = str(max(int(reset - now + 0.999), 1))
+                return False, headers
+            return True, headers
+
+
+# --- Server ---
+class FakeGitLabServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, data, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit=0, rate_window=60,
+                 token=None, seed=0):
+        super().__init__(address, FakeGitLabHandler)
+        self.data = data
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limiter = RateLimiter(rate_limit, rate_window)
+        self.token = token
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.stats = collections.Counter()   # "METHOD /endpoint/:id" -> requests
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def roll(self):
+        with self.random_lock:
+            return self.random.random(), self.random.uniform(0, self.jitter) if self.jitter else 0.0
+
+
+class FakeGitLabHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    routes = []
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        self.extra_headers = {}
+        server = self.server
+        parts = urlsplit(self.path)
+        with server.stats_lock:
+            server.stats[f"{method} {instrumentation.endpoint_template(parts.path)}"] += 1
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        error_roll, jitter = server.roll()
+        if server.latency or jitter:
+            time.sleep(server.latency + jitter)
+        allowed, rate_headers = server.rate_limiter.check()
+        self.extra_headers.update(rate_headers)
+        if not allowed:
+            return self.send_json(429, {"message": "429 Too Many Requests"})
+        if error_roll < server.error_rate:
+            return self.send_json(503, {"message": "503 Service Unavailable (injected)"})
+        if server.token and self.headers.get("PRIVATE-TOKEN") != server.token:
+            return self.send_json(401, {"message": "401 Unauthorized"})
+        if not parts.path.startswith(API_PREFIX):
+            return self.send_json(404, {"error": "404 Not Found"})
+
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        if body:
+            content_type = self.headers.get("Content-Type", "")
+            payload = json.loads(body) if "json" in content_type else {k: v[-1] for k, v in parse_qs(body.decode()).items()}
+            query.update(payload)
+        segments = [unquote(s) for s in parts.path[len(API_PREFIX):].strip("/").split("/")]
+        for route_method, pattern, func in self.routes:
+            if route_method != method or len(pattern) != len(segments):
+                continue
+            params = []
+            for expected, segment in zip(pattern, segments):
+                if expected == "*":
+                    params.append(segment)
+                elif expected != segment:
+                    break
+            else:
+                try:
+                    with server.data.lock:
+                        status, result = func(self, server.data, query, *params)
+                except ApiError as e:
+                    return self.send_json(e.status, {"message": e.message})
+                except (KeyError, ValueError) as e:
+                    return self.send_json(400, {"error": f"bad request: {e}"})
+                return self.send_json(status, result)
+        self.send_json(404, {"error": "404 Not Found"})
+
+    def send_json(self, status, result):
+        payload = b"" if status == 204 else json.dumps(result).encode()
+        if self.command == "GET" and status == 200:
+            # Weak ETag over the body, like GitLab's; a matching If-None-Match gets an empty 304
+            etag = f'W/"{hashlib.md5(payload).hexdigest()}"'
+            self.extra_headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in self.extra_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def route(method, path):
+    """Registers a handler for e.g. ('GET', 'projects/*/pipelines'); '*' segments are passed as arguments."""
+    def register(func):
+        FakeGitLabHandler.routes.append((method, path.split("/"), func))
+        return func
+    return register
+
+
+# --- Lookups ---
+def _group(data, group_id):
+    if group_id.isdigit():
+        group = data.groups.get(int(group_id))
+    else:
+        group = next((g for g in data.groups.values() if g["full_path"] == group_id), None)
+    if group is None:
+        raise ApiError(404, "404 Group Not Found")
+    return group
+
+def _project(data, project_id):
+    if project_id.isdigit():
+        project = data.projects.get(int(project_id))
+    else:
+        project = next((p for p in data.projects.values() if p["path_with_namespace"] == project_id), None)
+    if project is None:
+        raise ApiError(404, "404 Project Not Found")
+    return project
+
+def _members(data, members):
+    return [dict(data.users[user_id], access_level=level) for user_id, level in members.items()]
+
+def _since(records, field, value, inclusive=True):
+    if not value:
+        return records
+    return [r for r in records if r[field] and (r[field] >= value if inclusive else r[field] > value)]
+
+
+# --- Endpoints ---
+@route("GET", "user")
+def get_user(handler, data, query):
+    return 200, data.users[data.current_user]
+
+@route("GET", "users")
+def list_users(handler, data, query):
+    users = list(data.users.values())
+    if "username" in query:
+        users = [u for u in users if u["username"] == query["username"]]
+    return 200, paginate(handler, users, query)
+
+# Groups
+@route("GET", "groups")
+def list_groups(handler, data, query):
+    return 200, paginate(handler, list(data.groups.values()), query)
+
+@route("GET", "groups/*")
+def get_group(handler, data, query, group_id):
+    return 200, _group(data, group_id)
+
+@route("POST", "groups")
+def create_group(handler, data, query):
+    parent_id = int(query["parent_id"]) if query.get("parent_id") else None
+    if parent_id is None:
+        raise ApiError(403, "403 Forbidden - top-level groups cannot be created through the API")
+    return 201, data.add_group(query["name"], query["path"], parent_id)
+
+@route("GET", "groups/*/members")
+def list_group_members(handler, data, query, group_id):
+    return 200, paginate(handler, _members(data, data.group_members[_group(data, group_id)["id"]]), query)
+
+@route("GET", "groups/*/members/*")
+def get_group_member(handler, data, query, group_id, user_id):
+    members = data.group_members[_group(data, group_id)["id"]]
+    if int(user_id) not in members:
+        raise ApiError(404, "404 Not found")
+    return 200, dict(data.users[int(user_id)], access_level=members[int(user_id)])
+
+@route("POST", "groups/*/members")
+def add_group_member(handler, data, query, group_id):
+    members = data.group_members[_group(data, group_id)["id"]]
+    user_id = int(query["user_id"])
+    if user_id not in data.users:
+        raise ApiError(404, "404 User Not Found")
+    if user_id in members:
+        raise ApiError(409, "Member already exists")
+    members[user_id] = int(query["access_level"])
+    return 201, dict(data.users[user_id], access_level=members[user_id])
+
+@route("PUT", "groups/*/members/*")
+def update_group_member(handler, data, query, group_id, user_id):
+    members = data.group_members[_group(data, group_id)["id"]]
+    if int(user_id) not in members:
+        raise ApiError(404, "404 Not found")
+    members[int(user_id)] = int(query["access_level"])
+    return 200, dict(data.users[int(user_id)], access_level=members[int(user_id)])
+
+@route("DELETE", "groups/*/members/*")
+def remove_group_member(handler, data, query, group_id, user_id):
+    if data.group_members[_group(data, group_id)["id"]].pop(int(user_id), None) is None:
+        raise ApiError(404, "404 Not found")
+    return 204, None
+
+@route("GET", "groups/*/variables/*")
+def get_group_variable(handler, data, query, group_id, key):
+    variables = data.variables[_group(data, group_id)["id"]]
+    if key not in variables:
+        raise ApiError(404, "404 Variable Not Found")
+    return 200, {"key": key, "value": variables[key], "variable_type": "env_var"}
+
+@route("POST", "groups/*/variables")
+def create_group_variable(handler, data, query, group_id):
+    variables = data.variables[_group(data, group_id)["id"]]
+    if query["key"] in variables:
+        raise ApiError(400, {"key": [f"({query['key']}) has already been taken"]})
+    variables[query["key"]] = query.get("value", "")
+    return 201, {"key": query["key"], "value": variables[query["key"]], "variable_type": "env_var"}
+
+# Projects
+@route("GET", "projects")
+def list_projects(handler, data, query):
+    return 200, paginate(handler, list(data.projects.values()), query)
+
+@route("GET", "projects/*")
+def get_project(handler, data, query, project_id):
+    return 200, _project(data, project_id)
+
+@route("POST", "projects")
+def create_project(handler, data, query):
+    readme = str(query.get("initialize_with_readme", "false")).lower() in ("true", "1")
+    return 201, data.add_project(query["name"], query["namespace_id"], initialize_with_readme=readme)
+
+@route("POST", "projects/*/share")
+def share_project(handler, data, query, project_id):
+    project = _project(data, project_id)
+    group = _group(data, str(query["group_id"]))
+    if any(s["group_id"] == group["id"] for s in project["shared_with_groups"]):
+        raise ApiError(409, "Project is already shared with this group")
+    project["shared_with_groups"].append({"group_id": group["id"], "group_name": group["name"],
+                                          "group_full_path": group["full_path"],
+                                          "group_access_level": int(query["group_access"])})
+    return 201, {"project_id": project["id"], "group_id": group["id"], "group_access": int(query["group_access"])}
+
+@route("DELETE", "projects/*/share/*")
+def unshare_project(handler, data, query, project_id, group_id):
+    project = _project(data, project_id)
+    before = len(project["shared_with_groups"])
+    project["shared_with_groups"] = [s for s in project["shared_with_groups"] if s["group_id"] != int(group_id)]
+    if len(project["shared_with_groups"]) == before:
+        raise ApiError(404, "404 Not Found")
+    return 204, None
+
+@route("GET", "projects/*/members")
+def list_project_members(handler, data, query, project_id):
+    return 200, paginate(handler, _members(data, data.project_members[_project(data, project_id)["id"]]), query)
+
+@route("GET", "projects/*/members/*")
+def get_project_member(handler, data, query, project_id, user_id):
+    members = data.project_members[_project(data, project_id)["id"]]
+    if int(user_id) not in members:
+        raise ApiError(404, "404 Not found")
+    return 200, dict(data.users[int(user_id)], access_level=members[int(user_id)])
+
+@route("POST", "projects/*/members")
+def add_project_member(handler, data, query, project_id):
+    members = data.project_members[_project(data, project_id)["id"]]
+    user_id = int(query["user_id"])
+    if user_id in members:
+        raise ApiError(409, "Member already exists")
+    members[user_id] = int(query["access_level"])
+    return 201, dict(data.users[user_id], access_level=members[user_id])
+
+@route("PUT", "projects/*/members/*")
+def update_project_member(handler, data, query, project_id, user_id):
+    members = data.project_members[_project(data, project_id)["id"]]
+    if int(user_id) not in members:
+        raise ApiError(404, "404 Not found")
+    members[int(user_id)] = int(query["access_level"])
+    return 200, dict(data.users[int(user_id)], access_level=members[int(user_id)])
+
+@route("DELETE", "projects/*/members/*")
+def remove_project_member(handler, data, query, project_id, user_id):
+    if data.project_members[_project(data, project_id)["id"]].pop(int(user_id), None) is None:
+        raise ApiError(404, "404 Not found")
+    return 204, None
+
+# CI and issues
+_PIPELINE_LIST_FIELDS = ("id", "iid", "project_id", "sha", "ref", "status", "source", "created_at", "updated_at")
+
+@route("GET", "projects/*/pipelines")
+def list_pipelines(handler, data, query, project_id):
+    pipelines = data.pipelines[_project(data, project_id)["id"]]
+    if "status" in query:
+        pipelines = [p for p in pipelines if p["status"] == query["status"]]
+    if "ref" in query:
+        pipelines = [p for p in pipelines if p["ref"] == query["ref"]]
+    pipelines = _since(pipelines, "updated_at", query.get("updated_after"))
+    query.setdefault("order_by", "id")
+    # The list entries lack the timing fields, like GitLab's
+    return 200, [{k: p[k] for k in _PIPELINE_LIST_FIELDS} for p in paginate(handler, pipelines, query)]
+
+@route("GET", "projects/*/pipelines/*")
+def get_pipeline(handler, data, query, project_id, pipeline_id):
+    for pipeline in data.pipelines[_project(data, project_id)["id"]]:
+        if pipeline["id"] == int(pipeline_id):
+            return 200, pipeline
+    raise ApiError(404, "404 Not found")
+
+@route("GET", "projects/*/issues")
+def list_issues(handler, data, query, project_id):
+    issues = data.issues[_project(data, project_id)["id"]]
+    if query.get("state", "all") != "all":
+        issues = [i for i in issues if i["state"] == query["state"]]
+    issues = _since(issues, "updated_at", query.get("updated_after"))
+    query.setdefault("order_by", "created_at")
+    return 200, paginate(handler, issues, query)
+
+# Repository
+@route("GET", "projects/*/repository/commits")
+def list_commits(handler, data, query, project_id):
+    commits = _since(data.commits[_project(data, project_id)["id"]], "committed_date", query.get("since"))
+    return 200, paginate(handler, commits, query)
+
+@route("POST", "projects/*/repository/commits")
+def create_commit(handler, data, query, project_id):
+    project = _project(data, project_id)
+    files = data.files[project["id"]]
+    for action in query["actions"]:
+        path = action["file_path"]
+        if action["action"] == "create" and path in files:
+            raise ApiError(400, f"A file with this name already exists: {path}")
+        if action["action"] in ("update", "delete") and path not in files:
+            raise ApiError(400, f"A file with this name doesn't exist: {path}")
+    for action in query["actions"]:
+        if action["action"] == "delete":
+            del files[action["file_path"]]
+        else:
+            files[action["file_path"]] = action.get("content", "")
+    return 201, data.add_commit(project["id"], query["commit_message"], datetime.now(timezone.utc))
+
+@route("POST", "projects/*/repository/files/*")
+def create_file(handler, data, query, project_id, file_path):
+    project = _project(data, project_id)
+    if file_path in data.files[project["id"]]:
+        raise ApiError(400, "A file with this name already exists")
+    data.files[project["id"]][file_path] = query.get("content", "")
+    data.add_commit(project["id"], query.get("commit_message", f"Add {file_path}"), datetime.now(timezone.utc))
+    return 201, {"file_path": file_path, "branch": query.get("branch", "main")}
+
+@route("GET", "projects/*/repository/tree")
+def repository_tree(handler, data, query, project_id):
+    files = data.files[_project(data, project_id)["id"]]
+    directory = query.get("path", "").strip("/")
+    prefix = f"{directory}/" if directory else ""
+    if directory and not any(path.startswith(prefix) for path in files):
+        raise ApiError(404, "404 Tree Not Found")
+    entries = {}
+    recursive = str(query.get("recursive", "false")).lower() == "true"
+    for path, content in files.items():
+        if not path.startswith(prefix):
+            continue
+        rest = path[len(prefix):]
+        if "/" in rest and not recursive:
+            name = rest.split("/")[0]
+            entries[prefix + name] = {"id": hashlib.sha1((prefix + name).encode()).hexdigest(), "name": name,
+                                      "type": "tree", "path": prefix + name, "mode": "040000"}
+        else:
+            entries[path] = {"id": git_blob_sha(content.encode()), "name": path.rsplit("/", 1)[-1],
+                             "type": "blob", "path": path, "mode": "100644"}
+    return 200, paginate(handler, sorted(entries.values(), key=lambda e: e["path"]), query)
+
+@route("POST", "projects/*/repository/tags")
+def create_tag(handler, data, query, project_id):
+    project = _project(data, project_id)
+    if query["tag_name"] in data.tags[project["id"]]:
+        raise ApiError(400, "Tag already exists")
+    commit = data.commits[project["id"]][0] if data.commits[project["id"]] else None
+    if commit is None:
+        raise ApiError(400, "Target main is invalid")
+    data.tags[project["id"]][query["tag_name"]] = commit["id"]
+    return 201, {"name": query["tag_name"], "target": commit["id"], "commit": commit}
+
+@route("POST", "projects/*/protected_tags")
+def protect_tag(handler, data, query, project_id):
+    project = _project(data, project_id)
+    if query["name"] in data.protected_tags[project["id"]]:
+        raise ApiError(409, "Protected tag already exists")
+    level = int(query.get("create_access_level", 40))
+    data.protected_tags[project["id"]][query["name"]] = level
+    return 201, {"name": query["name"], "create_access_levels": [{"access_level": level}]}
+
+
+def start_server(data=None, host="127.0.0.1", port=0, **options):
+    """Starts the server in a daemon thread; port 0 picks a free port. Returns the server (server.url, server.shutdown())."""
+    server = FakeGitLabServer((host, port), data if data is not None else FakeData().seed(), **options)
+    threading.Thread(target=server.serve_forever, name="fake-gitlab", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local fake GitLab REST API seeded with synthetic data.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--groups", type=int, default=20)
+    parser.add_argument("--projects-per-group", type=int, default=10)
+    parser.add_argument("--pipelines", type=int, default=50, help="pipelines per project")
+    parser.add_argument("--issues", type=int, default=30, help="issues per project")
+    parser.add_argument("--commits", type=int, default=20, help="commits per project")
+    parser.add_argument("--members", type=int, default=5, help="members per group")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests per window before 429s (0 = no limit)")
+    parser.add_argument("--rate-window", type=int, default=60, help="rate limit window in seconds")
+    parser.add_argument("--token", help="only accept this PRIVATE-TOKEN (default: any)")
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    data = FakeData().seed(groups=args.groups, projects_per_group=args.projects_per_group,
+                           pipelines_per_project=args.pipelines, issues_per_project=args.issues,
+                           commits_per_project=args.commits, members_per_group=args.members,
+                           users=args.users, seed=args.seed)
+    print(f"Seeded {len(data.groups)} groups, {len(data.projects)} projects, "
+          f"{sum(map(len, data.pipelines.values()))} pipelines and {sum(map(len, data.issues.values()))} issues "
+          f"in {time.perf_counter() - start_time:.1f} seconds.")
+    server = FakeGitLabServer((args.host, args.port), data, latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, rate_limit=args.rate_limit, rate_window=args.rate_window,
+                              token=args.token, seed=args.seed)
+    print(f"Fake GitLab listening on {server.url} (set GITLAB_URL={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
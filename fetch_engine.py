@@ -0,0 +1,105 @@
+import concurrent.futures
+import contextvars
+import math
+from datetime import datetime
+
+import gitlab
+
+import jobs
+
+# Number of detail calls that may be in flight at once, per job. The shared connection
+# pool is sized from it (gitlab_client.default_pool_size: jobs x this, 32), so every
+# worker of every background job has a socket of its own.
+DEFAULT_MAX_WORKERS = 8
+
+
+# --- Detail fetching ---
+def fetch_details(manager, ids, max_workers=DEFAULT_MAX_WORKERS, **kwargs):
+    """
+    Calls manager.get(id) for every id using a bounded pool of worker threads.
+    Returns a tuple (objects, errors): objects keeps the order of ids and skips
+    failed calls, errors maps each failed id to its GitlabError.
+    """
+    ids = list(ids)
+    if not ids:
+        return [], {}
+
+    results = {}
+    errors = {}
+    workers = max(1, min(max_workers, len(ids)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # Each worker runs in a copy of the caller's context so per-request state
+        # (current action, request priority, ...) follows the detail calls.
+        futures = {
+            executor.submit(contextvars.copy_context().run, _get, manager, object_id, **kwargs): object_id
+            for object_id in ids
+        }
+        for future in concurrent.futures.as_completed(futures):
+            object_id = futures[future]
+            try:
+                results[object_id] = future.result()
+            except gitlab.exceptions.GitlabError as e:
+                errors[object_id] = e
+
+    objects = [results[object_id] for object_id in ids if object_id in results]
+    return objects, errors
+
+
+def _get(manager, object_id, **kwargs):
+    # Remaining detail calls are skipped once the job that started them is cancelled
+    jobs.raise_if_cancelled()
+    return manager.get(object_id, **kwargs)
+
+
+# --- Timestamp helpers ---
+def parse_timestamp(value):
+    """Parses a GitLab ISO 8601 timestamp ('2025-01-01T10:00:00.000Z'), or returns None."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.removesuffix('Z'))
+
+
+def duration_seconds(start, end):
+    """Returns the number of seconds between two GitLab timestamps, or None if either is missing."""
+    start_time = parse_timestamp(start)
+    end_time = parse_timestamp(end)
+    if start_time is None or end_time is None:
+        return None
+    return (end_time - start_time).total_seconds()
+
+
+# --- Duration statistics ---
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile (0-100) of an already sorted list."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def duration_stats(durations):
+    """Returns count, average and p50/p95/p99 (in seconds) for a list of durations."""
+    values = sorted(durations)
+    return {
+        "count": len(values),
+        "average": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+
+def summarise_timings(timings):
+    """Builds the overall and per-ref duration statistics for a list of (ref, seconds)."""
+    by_ref = {}
+    for ref, seconds in timings:
+        by_ref.setdefault(ref, []).append(seconds)
+
+    summary = duration_stats([seconds for _, seconds in timings])
+    summary["by_ref"] = {ref: duration_stats(values) for ref, values in sorted(by_ref.items())}
+    return summary
@@ -1,19 +1,19 @@
 import tkinter as tk
-from tkinter import scrolledtext, ttk, Listbox, messagebox
+from tkinter import scrolledtext, ttk, Listbox, messagebox, filedialog
 import gitlab
 import os, sys
+import collections
+import queue
+import time
 from dotenv import load_dotenv
 import backend
+import gitlab_client
+import instrumentation
+import jobs
+import search_index
+import sharing
+import snapshot
     
-def gl_connection():
-    gl = backend.connect_to_gitlab()
-    if gl:
-        print("Connection successful.")
-        return gl
-    else:
-        print("Connection failed.")
-        return None
-
 def generate_report(project_id):
     """Placeholder for your report generation logic."""
     if not project_id.isdigit():
@@ -69,14 +69,18 @@ class SettingsWindow(tk.Toplevel):
 
 # --- Terminal panel ---
 class TerminalPanel(tk.Frame):
+    # Maximum number of lines kept in the console; older lines are dropped
+    MAX_LINES = 5000
+    # How often (ms) buffered output is written to the widget
+    FLUSH_INTERVAL_MS = 100
+
     class TextRedirector:
-        def __init__(self, text_widget):
-            self.text_widget = text_widget
+        """File-like stdout replacement. write() only queues the text, so it is safe from any thread."""
+        def __init__(self, output_queue):
+            self.output_queue = output_queue
 
         def write(self, text):
-            self.text_widget.insert(tk.END, text)
-            self.text_widget.see(tk.END)
-            self.text_widget.update_idletasks()
+            self.output_queue.put(text)
 
         def flush(self):
             pass
@@ -94,12 +98,147 @@ class TerminalPanel(tk.Frame):
         self.text_widget.pack(expand=True, fill='both')
 
         # --- Redirect stdout ---
-        self.redirector = self.TextRedirector(self.text_widget)
+        self.output_queue = queue.SimpleQueue()
+        self.redirector = self.TextRedirector(self.output_queue)
         sys.stdout = self.redirector
+        self.flush_id = self.after(self.FLUSH_INTERVAL_MS, self.flush_output)
+
+    def flush_output(self):
+        """Writes everything queued since the last flush to the widget in one insert."""
+        # Ring buffer: a burst larger than MAX_LINES only keeps its newest lines
+        lines = collections.deque(maxlen=self.MAX_LINES)
+        partial = ""
+        while True:
+            try:
+                text = self.output_queue.get_nowait()
+            except queue.Empty:
+                break
+            chunks = (partial + text).split("\n")
+            partial = chunks.pop()
+            lines.extend(chunks)
+
+        if lines or partial:
+            text = "".join(line + "\n" for line in lines) + partial
+            self.text_widget.insert(tk.END, text)
+            # Trim the widget itself to the newest MAX_LINES lines
+            line_count = int(self.text_widget.index("end-1c").split(".")[0])
+            if line_count > self.MAX_LINES:
+                self.text_widget.delete("1.0", f"{line_count - self.MAX_LINES + 1}.0")
+            self.text_widget.see(tk.END)
+        self.flush_id = self.after(self.FLUSH_INTERVAL_MS, self.flush_output)
     
     def on_closing(self):
         """Restores stdout when the application is closing."""
         sys.stdout = sys.__stdout__
+        self.after_cancel(self.flush_id)
+
+# --- Virtualized list ---
+class VirtualListbox(tk.Frame):
+    """
+    Listbox holding only the visible rows: all labels stay in a Python list and
+    scrolling re-renders the window of `height` rows, so 10k items cost the same as 10.
+    """
+    def __init__(self, parent, width=50, height=8):
+        super().__init__(parent)
+        self.items = []       # labels of all rows
+        self.offset = 0       # index of the first visible row
+        self.selected = None  # index of the selected row in items
+        self.height = height
+        self.listbox = tk.Listbox(self, width=width, height=height, exportselection=False, activestyle='none')
+        self.scrollbar = tk.Scrollbar(self, orient='vertical', command=self.on_scrollbar)
+        self.listbox.pack(side='left', expand=True, fill='both')
+        self.scrollbar.pack(side='right', fill='y')
+        self.listbox.bind('<<ListboxSelect>>', self.on_select)
+        self.listbox.bind('<MouseWheel>', lambda event: self.scroll_to(self.offset - (3 if event.delta > 0 else -3)))
+        self.listbox.bind('<Button-4>', lambda event: self.scroll_to(self.offset - 3))
+        self.listbox.bind('<Button-5>', lambda event: self.scroll_to(self.offset + 3))
+        self.listbox.bind('<Up>', lambda event: self.move_selection(-1))
+        self.listbox.bind('<Down>', lambda event: self.move_selection(1))
+        self.listbox.bind('<Prior>', lambda event: self.move_selection(-self.height))
+        self.listbox.bind('<Next>', lambda event: self.move_selection(self.height))
+
+    def set_items(self, items):
+        self.items = items
+        self.offset = 0
+        self.selected = 0 if items else None
+        self.render()
+
+    def render(self):
+        self.listbox.delete(0, tk.END)
+        visible = self.items[self.offset:self.offset + self.height]
+        if visible:
+            self.listbox.insert(tk.END, *visible)
+        if self.selected is not None and self.offset <= self.selected < self.offset + len(visible):
+            self.listbox.selection_set(self.selected - self.offset)
+        total = len(self.items) or 1
+        self.scrollbar.set(self.offset / total, min((self.offset + self.height) / total, 1.0))
+
+    def scroll_to(self, offset):
+        self.offset = max(0, min(offset, len(self.items) - self.height))
+        self.render()
+        return "break"
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.items)))
+        elif action == 'scroll':
+            self.scroll_to(self.offset + int(amount) * (self.height if unit == 'pages' else 1))
+
+    def on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.offset + selection[0]
+
+    def move_selection(self, step):
+        if not self.items:
+            return "break"
+        self.selected = max(0, min((self.selected or 0) + step, len(self.items) - 1))
+        if self.selected < self.offset:
+            self.offset = self.selected
+        elif self.selected >= self.offset + self.height:
+            self.offset = self.selected - self.height + 1
+        self.render()
+        return "break"
+
+# --- Searchable picker ---
+class SearchablePicker(tk.Frame):
+    """
+    Type-ahead filter over a VirtualListbox. Entries are (key, label, search text);
+    every keystroke is one SearchIndex lookup and one re-render of the visible rows.
+    """
+    def __init__(self, parent, title, noun, entries=(), height=8):
+        super().__init__(parent)
+        self.noun = noun
+        self.positions = []   # row -> position in the index
+        tk.Label(self, text=title).pack()
+        self.query = tk.StringVar()
+        search_entry = tk.Entry(self, textvariable=self.query, width=50)
+        search_entry.pack(pady=(0, 2))
+        search_entry.bind('<Down>', lambda event: self.rows.listbox.focus_set())
+        self.rows = VirtualListbox(self, height=height)
+        self.rows.pack(expand=True, fill='both')
+        self.count_label = tk.Label(self)
+        self.count_label.pack()
+        self.set_entries(entries)
+        self.query.trace_add('write', lambda *args: self.apply_filter())
+
+    def set_entries(self, entries):
+        self.index = search_index.SearchIndex(entries)
+        self.apply_filter()
+
+    def apply_filter(self):
+        self.positions = self.index.search(self.query.get())
+        labels = self.index.labels
+        self.rows.set_items([labels[position] for position in self.positions])
+        if not len(self.index):
+            self.count_label.config(text=f"No {self.noun} found.")
+        else:
+            self.count_label.config(text=f"{len(self.positions)} of {len(self.index)} {self.noun}")
+
+    def selected_key(self):
+        if self.rows.selected is None:
+            return None
+        return self.index.keys[self.positions[self.rows.selected]]
 
 # --- Project Selection Panel ---
 class ProjectSelectionPanel(tk.Frame):
@@ -109,50 +248,32 @@ class ProjectSelectionPanel(tk.Frame):
         self.submit_callback = submit_callback
 
         # --- Create the widgets inside this frame ---
-        self.project_list_frame = tk.Frame(self)
-        self.project_list_frame.pack(pady=5)
-        self.current_project_option = tk.StringVar()
-        tk.Label(self.project_list_frame, text="Project list:").pack()
-        self.project_listbox = tk.Listbox(self.project_list_frame, width=50, height=5)
-        self.project_listbox.pack(pady=(5, 20))
-        for key, value in self.projects.items():
-            self.project_listbox.insert(tk.END, f" {value} ({key})")
-        
+        self.picker = SearchablePicker(self, "Project list (type to filter):", "projects", self.entries(project_data))
+        self.picker.pack(pady=(5, 20))
 
-        # Extract Project ID from string and convert into int for handler function
         submit_button = tk.Button(self, text="Select this project", command=self.on_submit)
         submit_button.pack()
 
         self.current_project_label = tk.Label(self, text="Current project selection:", width=50, height=5)
         self.current_project_label.pack()
 
+    @staticmethod
+    def entries(project_data):
+        return [(project_id, f" {details['name']} ({project_id})", f"{details['name']} {details['path']} {project_id}")
+                for project_id, details in project_data.items()]
+
     def on_submit(self):
-        project_id = int(self.project_listbox.get(tk.ACTIVE).split("(")[1].strip(")"))
-        if self.submit_callback:
-            self.submit_callback(project_id)
+        project_id = self.picker.selected_key()
+        if project_id is not None and self.submit_callback:
+            self.submit_callback(int(project_id))
             self.current_project_label.config(text=f"Current project selection: {project_id}")
 
     def update_options(self, new_project_data):
-        # Destroy all old widgets inside the frame
-        for widget in self.project_list_frame.winfo_children():
-            widget.destroy()
-            print("destroyed old widgets")
-
-        # Create the new list of display strings
-        project_display_options = list(f"{details}({project_id})"
-                                       for project_id, details in new_project_data.items())
-
-        if not project_display_options:
-            tk.Label(self.project_list_frame, text="No projects found.").pack()
+        # Same data as shown (e.g. a tab switch without a reload): keep the index and the filter
+        if new_project_data is self.projects and len(self.picker.index) == len(new_project_data):
             return
-        
-        # Create a new Listbox with the new options
-        tk.Label(self.project_list_frame, text="Project list:").pack()
-        self.project_listbox = tk.Listbox(self.project_list_frame, width=50, height=5)
-        self.project_listbox.pack(pady=(5, 20))
-        for key, value in new_project_data.items():
-            self.project_listbox.insert(tk.END, f" {value} ({key})")
-        #print("PANEL: Dropdown has been updated with new data.")
+        self.projects = new_project_data
+        self.picker.set_entries(self.entries(new_project_data))
 
 # --- Group Selection Panel ---
 class GroupSelectionPanel(tk.Frame):
@@ -160,82 +281,80 @@ class GroupSelectionPanel(tk.Frame):
         super().__init__(parent)
         self.groups = group_data
         self.submit_callback = submit_callback
+        self.current_group_id = None
 
         # --- Create the widgets inside this frame ---
-        self.dropdown_frame = tk.Frame(self)
-        self.dropdown_frame.pack(pady=5)
-        tk.Label(self.dropdown_frame, text="Group list:").pack()
-        self.group_options = list(f"{group_detail['name']} ({group_id})" for group_id, group_detail in self.groups.items())
-        self.current_group_option = tk.StringVar(value=self.group_options[0])
-        dropdown = tk.OptionMenu(self.dropdown_frame, self.current_group_option, *self.group_options)
-        dropdown.pack()
-        self.current_group_id = self.current_group_option.get().split('(')[1].strip(')')
+        # First start without a snapshot: filled in by update_options once loaded
+        self.picker = SearchablePicker(self, "Group list (type to filter):", "groups", self.entries(group_data), height=6)
+        self.picker.pack(pady=5)
         self.current_group_label = tk.Label(self, text="Current group selection:", width=50, height=5)
         self.current_group_label.pack()
         submit_button = tk.Button(self, text="Select this group", command=self.on_submit)
         submit_button.pack(pady=20)
 
+    @staticmethod
+    def entries(group_data):
+        return [(group_id, f"{details['name']} ({group_id})", f"{details['name']} {details.get('full_path', '')} {group_id}")
+                for group_id, details in group_data.items()]
+
     def on_submit(self):
+        group_id = self.picker.selected_key()
+        if group_id is None:
+            return
+        self.current_group_id = group_id
         if self.submit_callback:
             self.submit_callback(self.current_group_id)
             self.current_group_label.config(text=f"Current group selection: {self.current_group_id}")
 
     def update_options(self, new_group_data):
-        # Destroy all old widgets inside the frame
-        for widget in self.dropdown_frame.winfo_children():
-            widget.destroy()
-
-        # Create the new list of display strings
-        group_display_options = list(f"{details['name']} ({group_id})" 
-                                     for group_id, details in new_group_data.items())
-
-        if not group_display_options:
-            tk.Label(self.dropdown_frame, text="No groups found.").pack()
+        # Same data as shown (e.g. a tab switch without a reload): keep the index and the filter
+        if new_group_data is self.groups and len(self.picker.index) == len(new_group_data):
             return
-
-        # Set a default value for the StringVar
-        self.current_group_option.set(group_display_options[0])
-        
-        # Create a new OptionMenu with the new options
-        new_dropdown = tk.OptionMenu(self.dropdown_frame, self.current_group_option, *group_display_options)
-        new_dropdown.pack()
-        print("PANEL: Dropdown has been updated with new data.")
+        self.groups = new_group_data
+        self.picker.set_entries(self.entries(new_group_data))
+        print("PANEL: Group list has been updated with new data.")
 
 # --- GUI Application ---
 class GitLabApp:
     def __init__(self, root):
+        # Time to first paint is measured from here
+        self.start_time = time.perf_counter()
         self.root = root
         self.root.title("GitLab Analytics Dashboard")
         self.root.geometry("1000x800")
 
-        # Connect to gitlab instance
-        self.gl = gl_connection()
-
-        # Close the app if connection fails and open settings windo
-        if not self.gl:
-            print("Opening settings window...")
-            SettingsWindow(root, on_success_callback=self.finish_setup)
+        # Background executor for backend calls, so the window never freezes
+        self.jobs = jobs.JobExecutor(self.root)
+        self.analytics_job = None
 
         # Load env variables
+        load_dotenv()
         self.parent_group_id = os.environ.get("PARENT_GROUP_ID")
 
-        # Set up necessary variables in GitLab
-        self.variable_setup()
+        # Warm start: the window is drawn from the last snapshot, the connection,
+        # variable setup and fresh listings all happen in the background afterwards
+        self.gl = None
+        self.snapshot = snapshot.load(os.environ.get("GITLAB_URL"))
+        # Set once a complete refresh replaced the snapshot data; only then is it saved again on close
+        self.refreshed = False
 
-        # Retrieving Group data
-        self.groups = {}
-        self.fetch_group_data()
+        # Group data (group -> project catalog)
+        self.catalog = self.snapshot.catalog
+        self.groups = self.catalog.group_options()
 
         # Current selected group ID
         self.current_group_id = None
 
-        # Retrieving Projects data
-        self.projects = {}
-        self.fetch_project_data()
+        # Projects data
+        self.projects = dict(self.snapshot.projects)
 
          # Current selected project ID
         self.current_project_id = tk.StringVar()
 
+        # Project x group sharing matrix, loaded in the background and then updated locally
+        self.sharing = None
+        self.verify_sharing = tk.BooleanVar(value=False)
+
         # --- Load project group data ---
         self.current_project_id.trace_add('write', self.handler_fetch_project_group_data)
 
@@ -266,67 +385,153 @@ class GitLabApp:
         self.notebook.pack(expand=True, fill='both', padx=10, pady=10)
 
         # Create central terminal panel
-        TerminalPanel(self.root).pack(expand=True, fill='both', padx=10, pady=10)\
-        
+        self.terminal = TerminalPanel(self.root)
+        self.terminal.pack(expand=True, fill='both', padx=10, pady=10)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+        self.root.after_idle(self.report_first_paint)
+        self.connect_in_background()
+
+    def report_first_paint(self):
+        seconds = time.perf_counter() - self.start_time
+        age = self.snapshot.age()
+        source = f"snapshot from {backend.format_seconds(age)} ago" if age is not None else "no snapshot yet"
+        print(f"--- First paint after {seconds:.2f} seconds ({source}). ---")
+
+    def on_closing(self):
+        self.jobs.shutdown()
+        if self.refreshed:
+            self.save_snapshot()
+        self.terminal.on_closing()
+        self.root.destroy()
+
+    def run_in_background(self, name, func, *args, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """
+        Runs a backend call on the job executor; on_done(result) or on_error(exception) is called on the Tk thread.
+        The REST calls it makes are counted as one action and summarised when it ends.
+        """
+        print(f"Starting '{name}'...")
+        def run_action():
+            with instrumentation.scope(name) as action:
+                result = func(*args, **kwargs)
+            print(f"--- {action.describe()} ---")
+            return result
+        return self.jobs.submit(name, run_action, on_done=on_done, on_error=on_error, on_progress=on_progress)
+
     def on_tab_changed(self, event):
         select_tab =   event.widget.tab('current')['text']
+        # Group tabs read from the catalog, which is kept up to date locally
         if select_tab == "User Management":
-            self.fetch_group_data()
             self.user_management_group_selection.update_options(self.groups)
-            print("User Management tab selected, group data refreshed.")
+            print("User Management tab selected, group data loaded from catalog.")
         elif select_tab == "Create Project":
-            self.fetch_group_data()
             self.create_project_group_selection.update_options(self.groups)
-            print("Create Project tab selected, group data refreshed.")
-        elif select_tab == "Project List":
-            self.fetch_project_data()
+            print("Create Project tab selected, group data loaded from catalog.")
+        elif select_tab in ("Project List", "Analytics") and self.gl:
+            # Shown from the current data right away, the refreshed list replaces it when it arrives
+            self.refresh_projects()
+            print(f"{select_tab} tab selected, refreshing project data in the background.")
+
+
+    # --- Startup and deferred refresh ---
+    def connect_in_background(self):
+        self.run_in_background("Connect", backend.connect_to_gitlab, on_done=self.on_connected)
+
+    def on_connected(self, gl):
+        if not gl:
+            print("Connection failed.")
+            print("Opening settings window...")
+            SettingsWindow(self.root, on_success_callback=self.finish_setup)
+            return
+        print("Connection successful.")
+        self.gl = gl
+        self.variable_setup()
+        self.refresh_in_background()
+
+    def refresh_in_background(self):
+        """
+        Reloads the catalog, the project names and the sharing matrix; panels are updated as each one arrives.
+        The snapshot is only replaced once both the catalog and the project names loaded successfully.
+        """
+        pending = {"catalog", "projects"}
+        def loaded(part):
+            pending.discard(part)
+            if not pending:
+                self.refreshed = True
+                self.snapshot.saved_at = time.time()
+                self.save_snapshot()
+                print(f"--- Fresh data shown {time.perf_counter() - self.start_time:.2f} seconds after start. ---")
+        def on_catalog(new_catalog):
+            if new_catalog is None:
+                print("Catalog could not be refreshed, keeping the last known groups and projects.")
+                return
+            self.catalog = new_catalog
+            self.groups = self.catalog.group_options()
+            self.user_management_group_selection.update_options(self.groups)
+            self.create_project_group_selection.update_options(self.groups)
+            loaded("catalog")
+        self.run_in_background("Load catalog", backend.load_catalog, self.gl, on_done=on_catalog)
+        self.refresh_projects(on_loaded=lambda: loaded("projects"))
+        self.run_in_background("Load sharing matrix", backend.load_sharing_matrix, self.gl, on_done=self.on_sharing_loaded)
+
+    def refresh_projects(self, on_loaded=None):
+        def on_done(projects):
+            self.projects = projects
             self.project_list_project_selection.update_options(self.projects)
-            print("Project List tab selected, project data refreshed.")
-        elif select_tab == "Analytics":
-            self.fetch_project_data()
             self.analytics_project_selection.update_options(self.projects)
-            print("Analytics tab selected, project data refreshed.")
-
-
-    def fetch_group_data(self):
-        self.groups = {}
-        project_list = []
-        groups = backend.list_groups(gl=self.gl)
-        for group in groups:
-            projects = group.projects.list(get_all=True)
-            if projects:
-                for project in projects:
-                    project_list.append({project.id: project.name})
-            self.groups[group.id] = {"name": group.name, "projects": project_list}
-
-    def fetch_project_data(self):
-        self.projects = {}
-        projects = backend.list_projects(gl=self.gl)
-        for project in projects:
-            self.projects[project.id] = project.name_with_namespace
+            if on_loaded:
+                on_loaded()
+        def on_error(e):
+            print(f"❌ Projects could not be refreshed, keeping the last known list: {e}")
+        self.run_in_background("Load projects", backend.project_names, self.gl, on_done=on_done, on_error=on_error)
+
+    def save_snapshot(self):
+        self.snapshot.catalog = self.catalog
+        self.snapshot.projects = self.projects
+        try:
+            snapshot.save(self.snapshot)
+        except OSError as e:
+            print(f"Could not save startup snapshot: {e}")
 
     def finish_setup(self):
         print("In finish setup function...")
-        self.gl = gl_connection()
-        if self.gl:
-            self.root.deiconify()
-        else:
-            # If it still fails, show an error and close for real
-            messagebox.showerror("Failed", "Connection still failed. Exiting.")
-            self.root.destroy()
+        # The settings window just wrote .env: read it again and drop the client built from the old values
+        load_dotenv(override=True)
+        self.parent_group_id = os.environ.get("PARENT_GROUP_ID")
+        self.snapshot.gitlab_url = os.environ.get("GITLAB_URL")
+        gitlab_client.reset_client()
+        def on_done(gl):
+            if gl:
+                print("Connection successful.")
+                self.gl = gl
+                self.root.deiconify()
+                self.variable_setup()
+                self.refresh_in_background()
+            else:
+                # If it still fails, show an error and close for real
+                messagebox.showerror("Failed", "Connection still failed. Exiting.")
+                self.root.destroy()
+        self.run_in_background("Connect", backend.connect_to_gitlab, on_done=on_done)
 
     def variable_setup(self):
+        # Known to exist from an earlier run: no request at all
+        if str(self.parent_group_id) in self.snapshot.variables:
+            print("✅ Variables already set up, skipped.")
+            return
         token = os.environ.get("GITLAB_PRIVATE_TOKEN")
-        if backend.variable_setup(self.gl, self.parent_group_id, token):
-            print("✅ Variables set up successfully.")
-        else:
-            print("❌ Failed to set up variables/ variables already exist.")
+        def on_done(ok):
+            if ok:
+                self.snapshot.variables.add(str(self.parent_group_id))
+                print("✅ Variables set up successfully.")
+            else:
+                print("❌ Failed to set up variables.")
+        self.run_in_background("Variable setup", backend.variable_setup, self.gl, self.parent_group_id, token, on_done=on_done)
 
     def populate_create_group_tab(self):
         tk.Label(self.create_group_tab, text="Group Name:").pack(pady=(20, 5))
         name_entry = tk.Entry(self.create_group_tab, width=50)
         name_entry.pack()
-        submit_button = tk.Button(self.create_group_tab, text="Create Group" , command=lambda: backend.create_group(self.gl, name_entry.get(), self.parent_group_id))
+        submit_button = tk.Button(self.create_group_tab, text="Create Group" , command=lambda: self.handler_create_group(name_entry.get()))
         submit_button.pack(pady=20)
 
     def populate_user_management_tab(self):
@@ -341,7 +546,7 @@ class GitLabApp:
                             group_data=self.groups,
                             submit_callback=self.handler_group_selection)
         self.user_management_group_selection.pack(expand=True, fill="both", padx=10, pady=5)
-        submit_button = tk.Button(self.user_management_tab, text="List users in group", command=lambda: backend.list_user_in_group(self.gl, self.current_group_id))
+        submit_button = tk.Button(self.user_management_tab, text="List users in group", command=lambda: self.run_in_background("List users", backend.list_user_in_group, self.gl, self.current_group_id))
         submit_button.pack(padx=20)
         tk.Label(self.user_management_tab, text="User ID:").pack(pady=10)
         name_entry = tk.Entry(self.user_management_tab, width=50)
@@ -354,6 +559,8 @@ class GitLabApp:
         submit_button.pack(pady=20)        
         submit_button = tk.Button(self.user_management_tab, text="Change user role", command=lambda: self.handler_change_user_role(group_id=self.current_group_id, user_id=name_entry.get(), new_access_level=self.user_access_level.get()))
         submit_button.pack(pady=20)
+        submit_button = tk.Button(self.user_management_tab, text="Apply membership file (CSV/YAML)", command=self.handler_apply_membership_file)
+        submit_button.pack(pady=(0, 20))
     
     def populate_project_list_tab(self):
         self.project_list_project_selection = ProjectSelectionPanel(
@@ -361,7 +568,7 @@ class GitLabApp:
             project_data=self.projects, 
             submit_callback=self.handler_project_selection)
         self.project_list_project_selection.pack(expand=True, fill='both', padx=10, pady=5)
-        submit_button = tk.Button(self.project_list_tab, text="See project summary", command=lambda: backend.get_project_summary(backend.get_project_by_id(self.gl, self.current_project_id.get())))
+        submit_button = tk.Button(self.project_list_tab, text="See project summary", command=self.handler_project_summary)
         submit_button.pack(pady=0)
 
          # --- Main content frame for the listboxes ---
@@ -387,6 +594,8 @@ class GitLabApp:
         tk.Label(right_frame, text="Already Shared With").pack()
         self.shared_listbox = Listbox(right_frame, selectmode='single', exportselection=False)
         self.shared_listbox.pack(expand=True, fill='both')
+        tk.Checkbutton(self.project_list_tab, text="Verify sharing with the server after each change",
+                       variable=self.verify_sharing).pack(pady=(0, 5))
 
 
     def populate_create_project_tab(self):
@@ -400,8 +609,10 @@ class GitLabApp:
                             submit_callback=self.handler_group_selection)
         self.create_project_group_selection.pack(expand=True, fill="both", padx=10, pady=5)
 
-        submit_button = tk.Button(self.create_project_tab, text="Create Project", command=lambda: backend.create_project(self.gl, name_entry.get(), self.current_group_id))
-        submit_button.pack(pady=20)
+        submit_button = tk.Button(self.create_project_tab, text="Create Project", command=lambda: self.handler_create_project(name_entry.get(), self.current_group_id))
+        submit_button.pack(pady=(20, 5))
+        manifest_button = tk.Button(self.create_project_tab, text="Create projects from manifest (CSV/YAML)", command=self.handler_provision_manifest)
+        manifest_button.pack(pady=(5, 20))
 
     def populate_analytics_tab(self):
         """Adds widgets to the 'Analytics' tab."""
@@ -416,7 +627,11 @@ class GitLabApp:
         dropdown.pack()
 
         submit_button = tk.Button(self.analytics_tab, text="Generate Report", command = self.run_analytics)
-        submit_button.pack(pady=20)
+        submit_button.pack(pady=(20, 5))
+        portfolio_button = tk.Button(self.analytics_tab, text="Portfolio Report (all projects)", command=self.run_portfolio)
+        portfolio_button.pack(pady=(0, 5))
+        cancel_button = tk.Button(self.analytics_tab, text="Cancel Report", command=self.cancel_analytics)
+        cancel_button.pack(pady=(0, 20))
 
     def create_widgets(self):
         # Frame for input
@@ -443,11 +658,25 @@ class GitLabApp:
         report_type = self.analytics_report_type.get()
         print(f"Generating {report_type} report...")
         if report_type == "Pipeline Success Rate":
-            data = backend.pipeline_successful_report(self.gl, self.current_project_id.get())
+            report = backend.pipeline_successful_report
         elif report_type == "Pipeline Run Time":
-            data = backend.pipeline_run_time_report(self.gl, self.current_project_id.get())
+            report = backend.pipeline_run_time_report
         elif report_type == "Issue Completion":
-            data = backend.issue_completion_report(self.gl, self.current_project_id.get())
+            report = backend.issue_completion_report
+        # Several reports may run at once; the cancel button stops the latest one
+        self.analytics_job = self.run_in_background(f"{report_type} report", report, self.gl, self.current_project_id.get())
+
+    def run_portfolio(self):
+        print("Generating portfolio report over all owned projects...")
+        self.analytics_job = self.run_in_background("Portfolio report", backend.portfolio_report, self.gl,
+                                                    on_progress=print)
+
+    def cancel_analytics(self):
+        if self.analytics_job and not self.analytics_job.done:
+            print(f"Cancelling '{self.analytics_job.name}'...")
+            self.analytics_job.cancel()
+        else:
+            print("No report is running.")
 
     def run_report(self):
         # Get the project ID from the entry field
@@ -464,16 +693,11 @@ class GitLabApp:
         self.output_text.insert(tk.END, f"Generating report for project {project_id}...")
         self.root.update_idletasks() # Update the GUI to show the message
 
-        # Run your actual report-generating function
-        report_data = gl_connection()
-        gl = backend.connect_to_gitlab()
-
-        projects = backend.list_projects(gl=gl)
-
+        # Run your actual report-generating function on the shared client
+        projects = backend.list_projects(gl=self.gl)
 
         # Display the final report
         self.output_text.delete('1.0', tk.END)
-        self.output_text.insert(tk.END, report_data)
         for project in projects:
             self.output_text.insert(tk.END, f"Project: {project.name_with_namespace}\n")
             self.output_text.insert(tk.END, f"ID: {project.id}\n")
@@ -489,29 +713,107 @@ class GitLabApp:
         print(f"Now chosen group {group_id}")
         self.current_group_id = group_id
     
+    def handler_create_group(self, group_name):
+        def on_done(group):
+            if group:
+                # Keep the catalog in sync without listing everything again
+                self.catalog.add_group(group)
+                self.groups = self.catalog.group_options()
+        self.run_in_background("Create Group", backend.create_group, self.gl, group_name, self.parent_group_id, on_done=on_done)
+
+    def handler_create_project(self, project_name, group_id):
+        def on_done(project):
+            if project:
+                self.catalog.add_project(project)
+                self.groups = self.catalog.group_options()
+        self.run_in_background("Create Project", backend.create_project, self.gl, project_name, group_id, on_done=on_done)
+
+    def handler_provision_manifest(self):
+        path = filedialog.askopenfilename(title="Project manifest",
+                                          filetypes=[("Manifest files", "*.csv *.yml *.yaml"), ("All files", "*.*")])
+        if not path:
+            return
+        def on_done(results):
+            for result in results or []:
+                if result["project"]:
+                    self.catalog.add_project(result["project"])
+            self.groups = self.catalog.group_options()
+        # Entries without a group go to the group selected on this tab
+        self.run_in_background("Create projects from manifest", backend.provision_projects_from_manifest, self.gl, path,
+                               default_group=self.current_group_id, on_done=on_done, on_progress=print)
+
+    def handler_project_summary(self):
+        project_id = self.current_project_id.get()
+        self.run_in_background("Project summary",
+                               lambda: backend.get_project_summary(backend.get_project_by_id(self.gl, project_id)))
+
     def handler_user_add_remove(self, group_id, user_id, access_level):
         print(f"Now adding/ removing user {user_id} to group {group_id} with access level {access_level}")
-        if backend.checker_user_in_group(self.gl, group_id, user_id):
-            backend.remove_user_from_group(self.gl, user_id, group_id)
-        else:
-            backend.add_user_to_group(self.gl, user_id, group_id, access_level)
+        def add_or_remove():
+            if backend.checker_user_in_group(self.gl, group_id, user_id):
+                backend.remove_user_from_group(self.gl, user_id, group_id)
+            else:
+                backend.add_user_to_group(self.gl, user_id, group_id, access_level)
+        self.run_in_background("Add/ remove user", add_or_remove)
+
+    def handler_apply_membership_file(self):
+        path = filedialog.askopenfilename(title="Membership file",
+                                          filetypes=[("Membership files", "*.csv *.yml *.yaml"), ("All files", "*.*")])
+        if not path:
+            return
+        self.run_in_background("Apply membership file", backend.apply_membership_file, self.gl, path, on_progress=print)
+
+    def on_sharing_loaded(self, matrix):
+        if matrix is None:
+            # Start from the known groups instead; each selected project's row is then fetched on its own
+            print("❌ Sharing matrix could not be loaded, project sharing will be fetched per project.")
+            matrix = sharing.SharingMatrix()
+            for group_id, details in self.groups.items():
+                matrix.add_group(group_id, details["name"])
+        self.sharing = matrix
+        if self.current_project_id.get():
+            self.handler_fetch_project_group_data()
 
     def handler_fetch_project_group_data(self, *args):
+        project_id = self.current_project_id.get()
+        if not project_id:
+            return
+        if self.sharing is None:
+            print("Sharing matrix is still loading, the lists will fill in once it is ready.")
+            return
+        if self.sharing.has_project(project_id):
+            # Served from the local matrix, no request needed
+            self.populate_share_listboxes(project_id)
+            return
+        # A project created after the matrix was loaded: fetch its row once
         print("Fetching project group data...")
+        self.run_in_background("Fetch project group data", backend.load_project_sharing, self.gl, self.sharing, project_id,
+                               on_done=lambda _: self.populate_share_listboxes(project_id))
+
+    def populate_share_listboxes(self, project_id):
+        # Ignore results for a project that is no longer selected
+        if project_id != self.current_project_id.get() or not self.sharing.has_project(project_id):
+            return
         # Clear existing listboxes
         self.unshared_listbox.delete(0, tk.END)
         self.shared_listbox.delete(0, tk.END)
-        # Fetch and populate listboxes
-        project_id = self.current_project_id.get()
-        project, all_groups, shared_groups = backend.fetch_project_group_data(self.gl, project_id)
-        print(shared_groups)
-        # Create a set of shared group IDs for quick lookup
-        shared_groups_id = {group['group_id'] for group in shared_groups}
-        for group in all_groups:
-            if group.id not in shared_groups_id:
-                self.unshared_listbox.insert(tk.END, f"{group.name} ({group.id})")
-        for group in shared_groups:
-            self.shared_listbox.insert(tk.END, f"{group['group_name']} ({group['group_id']})")
+        for group_id, name in self.sharing.unshared_groups(project_id):
+            self.unshared_listbox.insert(tk.END, f"{name} ({group_id})")
+        for group_id, name in self.sharing.shared_groups(project_id):
+            self.shared_listbox.insert(tk.END, f"{name} ({group_id})")
+
+    def on_sharing_changed(self, project_id, group_id, shared, succeeded):
+        """Applies a successful share/unshare to the matrix, redraws, and optionally re-checks the server."""
+        if not succeeded:
+            return
+        if shared:
+            self.sharing.share(project_id, group_id)
+        else:
+            self.sharing.unshare(project_id, group_id)
+        self.populate_share_listboxes(project_id)
+        if self.verify_sharing.get():
+            self.run_in_background("Verify sharing", backend.verify_project_sharing, self.gl, self.sharing, project_id,
+                                   on_done=lambda _: self.populate_share_listboxes(project_id))
 
     def handler_share_selected_group(self):
         selection = self.unshared_listbox.curselection()
@@ -519,12 +821,12 @@ class GitLabApp:
         if not selection:
             messagebox.showwarning("No Selection", "Please select a group to share.")
             return
+        project_id = self.current_project_id.get()
         selected_group_id = self.unshared_listbox.get(selection[0]).split('(')[1].strip(')')
-        print(f"Sharing project {self.current_project_id.get()} with group {selected_group_id}")
-        backend.share_project_with_group(self.gl, self.current_project_id.get(), selected_group_id)
-
-        # Refresh the listboxes
-        self.handler_fetch_project_group_data()
+        print(f"Sharing project {project_id} with group {selected_group_id}")
+        # Update the matrix locally once shared
+        self.run_in_background("Share project", backend.share_project_with_group, self.gl, project_id, selected_group_id,
+                               on_done=lambda ok: self.on_sharing_changed(project_id, selected_group_id, True, ok))
 
     def handler_unshare_selected_group(self):
         selection = self.shared_listbox.curselection()
@@ -532,19 +834,22 @@ class GitLabApp:
         if not selection:
             messagebox.showwarning("No Selection", "Please select a group to unshare.")
             return
+        project_id = self.current_project_id.get()
         selected_group_id = self.shared_listbox.get(selection[0]).split('(')[1].strip(')')
-        print(f"Unsharing project {self.current_project_id.get()} from group {selected_group_id}")
-        backend.unshare_project_with_group(self.gl, self.current_project_id.get(), selected_group_id)
-
-        # Refresh the listboxes
-        self.handler_fetch_project_group_data()
+        print(f"Unsharing project {project_id} from group {selected_group_id}")
+        # Update the matrix locally once unshared
+        self.run_in_background("Unshare project", backend.unshare_project_with_group, self.gl, project_id, selected_group_id,
+                               on_done=lambda ok: self.on_sharing_changed(project_id, selected_group_id, False, ok))
 
     def handler_change_user_role(self, group_id, user_id, new_access_level):
         print(f"Now changing user {user_id} role in group {group_id} to access level {new_access_level}")
-        if backend.change_member_access_level_in_group(self.gl, user_id, group_id, new_access_level):
-            print(f"User {user_id} role changed successfully.")
-        else:
-            print(f"Failed to change user {user_id} role.")
+        def on_done(changed):
+            if changed:
+                print(f"User {user_id} role changed successfully.")
+            else:
+                print(f"Failed to change user {user_id} role.")
+        self.run_in_background("Change user role", backend.change_member_access_level_in_group,
+                               self.gl, user_id, group_id, new_access_level, on_done=on_done)
 
 # --- Main execution block ---
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+
+import gitlab
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+import fetch_engine
+import http_cache
+import instrumentation
+import jobs
+import scheduler
+
+# Items per page for every listing (GitLab's maximum), fewer pages = fewer round trips
+PER_PAGE = 100
+
+
+def default_pool_size():
+    """
+    Connections kept open per host. Each background job can run a full pool of
+    detail workers, so the pool covers jobs x fetch workers (GITLAB_POOL_SIZE overrides it).
+    """
+    configured = os.environ.get("GITLAB_POOL_SIZE")
+    if configured and configured.isdigit():
+        return int(configured)
+    return jobs.DEFAULT_MAX_WORKERS * fetch_engine.DEFAULT_MAX_WORKERS
+
+
+def build_session(pool_size=None, keep_alive=True, gzip=True, http_cache_enabled=True):
+    """
+    Creates the requests.Session used by python-gitlab: a pooled HTTPAdapter behind
+    the rate-limit-aware scheduler, which never admits more requests than the pool holds.
+    In front of it, the ETag cache turns repeated GET listings into 304 revalidations.
+    """
+    pool_size = pool_size or default_pool_size()
+    session = requests.Session()
+    pooled_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=False)
+    adapter = scheduler.ScheduledAdapter(pooled_adapter, scheduler.get_scheduler(max_limit=pool_size))
+    store = http_cache.get_store() if http_cache_enabled else None
+    if store is not None:
+        adapter = http_cache.CachingAdapter(adapter, store)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+    session.headers["Accept-Encoding"] = "gzip, deflate" if gzip else "identity"
+    instrumentation.instrument(session)
+    return session
+
+
+# --- Shared client ---
+_client = None
+_client_lock = threading.Lock()
+
+def create_client(gitlab_url=None, private_token=None, pool_size=None):
+    """Creates and authenticates a new Gitlab client. Raises GitlabError if the token is rejected."""
+    load_dotenv()
+    gitlab_url = gitlab_url or os.environ.get("GITLAB_URL")
+    private_token = private_token or os.environ.get("GITLAB_PRIVATE_TOKEN")
+    gl = gitlab.Gitlab(gitlab_url, private_token=private_token, session=build_session(pool_size), per_page=PER_PAGE)
+    # The only authentication call of the process; gl.user keeps the result
+    gl.auth()
+    return gl
+
+def get_client():
+    """
+    Returns the process-wide Gitlab client, creating and authenticating it on first use.
+    Every later call reuses the same client and its open connections.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = create_client()
+        return _client
+
+def reset_client():
+    """Drops the shared client (e.g. after the credentials in .env changed)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.session.close()
+        _client = None
+
+
+# --- Cold/warm latency ---
+def measure_latency(repeat=5, path="/user"):
+    """
+    Times the first get_client() (new client, TLS handshake and auth) against the
+    following calls that reuse it, and a cold request (first one on a fresh session,
+    so it opens its own connection) against warm ones on pooled connections.
+    """
+    reset_client()
+    start_time = time.perf_counter()
+    gl = get_client()
+    cold_client = time.perf_counter() - start_time
+
+    fresh = gitlab.Gitlab(gl.url, private_token=gl.private_token, session=build_session(http_cache_enabled=False))
+    try:
+        start_time = time.perf_counter()
+        fresh.http_get(path)
+        cold_request = time.perf_counter() - start_time
+    finally:
+        fresh.session.close()
+
+    warm_client = []
+    warm_request = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        gl = get_client()
+        warm_client.append(time.perf_counter() - start_time)
+        start_time = time.perf_counter()
+        gl.http_get(path)
+        warm_request.append(time.perf_counter() - start_time)
+
+    return {
+        "cold_client_seconds": cold_client,
+        "warm_client_seconds": sum(warm_client) / repeat,
+        "cold_request_seconds": cold_request,
+        "warm_request_seconds": sum(warm_request) / repeat,
+        "pool_size": default_pool_size(),
+    }
+
+
+if __name__ == "__main__":
+    result = measure_latency()
+    print(f"Pool size: {result['pool_size']}")
+    print(f"Cold client (connect + auth): {result['cold_client_seconds'] * 1000:.1f} ms")
+    print(f"Warm client (reused):         {result['warm_client_seconds'] * 1000:.3f} ms")
+    print(f"Cold request (new session):   {result['cold_request_seconds'] * 1000:.1f} ms")
+    print(f"Warm request (GET /user):     {result['warm_request_seconds'] * 1000:.1f} ms")
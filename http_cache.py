@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Location of the response cache (GITLAB_HTTP_CACHE_PATH overrides it, an empty value disables the cache)
+DEFAULT_CACHE_PATH = ".gitlab_http_cache.db"
+# Size of the stored bodies before the least recently used responses are evicted (GITLAB_HTTP_CACHE_MB overrides it)
+DEFAULT_MAX_MB = 50
+# Not stored: they describe the encoded body, and the stored body is already decoded
+# (lower case: header names are compared case-insensitively)
+_BODY_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+# Endpoints whose bodies hold secrets (CI/CD variable values, tokens, hook secrets): never written to disk
+NEVER_STORE = re.compile(r"/(variables|access_tokens|personal_access_tokens|deploy_tokens|hooks)(/|$)")
+# Bumped when stored rows may be unsafe or unreadable; older rows are dropped on open
+STORE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key       TEXT PRIMARY KEY,
+    etag      TEXT NOT NULL,
+    headers   TEXT NOT NULL,
+    body      BLOB NOT NULL,
+    size      INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+def storable(request, response):
+    """A 200 GET with an ETag, not from a secret-bearing endpoint and not marked no-store/private."""
+    if response.status_code != 200 or not response.headers.get("ETag"):
+        return False
+    if NEVER_STORE.search(urlsplit(request.url).path):
+        return False
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    return "no-store" not in cache_control and "private" not in cache_control
+
+def cache_key(request):
+    """The URL and the credentials: a response is only ever replayed to the token that fetched it."""
+    credentials = request.headers.get("PRIVATE-TOKEN") or request.headers.get("Authorization") or ""
+    return hashlib.sha256(f"{credentials}\n{request.url}".encode()).hexdigest()
+
+
+class ResponseStore:
+    """
+    SQLite store of GET responses that carried an ETag, bounded by the total body size.
+    Writes evict the least recently used responses once max_bytes is exceeded.
+    Bodies are stored as received, so the file is created readable by its owner only.
+    """
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(path, 0o600)
+        # One connection shared by every thread, guarded by self.lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+            # e.g. a file written before secret endpoints were excluded
+            with self.conn:
+                self.conn.execute("DELETE FROM responses")
+                self.conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def get(self, key):
+        """Returns (etag, headers, body) or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT etag, headers, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2]
+
+    def put(self, key, etag, headers, body):
+        if len(body) > self.max_bytes:
+            return
+        with self.lock, self.conn:
+            previous = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                              (key, etag, json.dumps(headers), body, len(body), time.time()))
+            self.total_bytes += len(body) - (previous[0] if previous else 0)
+            self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes:
+            oldest = self.conn.execute("SELECT key, size FROM responses ORDER BY last_used LIMIT 1").fetchone()
+            if oldest is None:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (oldest[0],))
+            self.total_bytes -= oldest[1]
+            self.evictions += 1
+
+    def record_hit(self, key, size):
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            self.bytes_saved += size
+
+    def record_miss(self):
+        with self.lock:
+            self.misses += 1
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM responses")
+            self.total_bytes = 0
+
+    def stats(self):
+        """Hit/miss counters (a 304 revalidation is a hit) and the hit rate (0-1, None before the first lookup)."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            entries = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "entries": entries,
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "bytes_saved": self.bytes_saved,
+            }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class CachingAdapter(BaseAdapter):
+    """
+    Transport adapter that revalidates stored GET responses with If-None-Match.
+    A 304 is turned back into the stored 200 response (marked from_cache), so
+    python-gitlab never sees it; a new 200 with an ETag replaces the stored one.
+    """
+    def __init__(self, inner, store):
+        super().__init__()
+        self.inner = inner
+        self.store = store
+
+    def send(self, request, **kwargs):
+        # Streamed downloads and requests with their own validators are passed through
+        if request.method != "GET" or kwargs.get("stream") or "If-None-Match" in request.headers:
+            return self.inner.send(request, **kwargs)
+        key = cache_key(request)
+        stored = self.store.get(key)
+        if stored:
+            request.headers["If-None-Match"] = stored[0]
+        response = self.inner.send(request, **kwargs)
+
+        if response.status_code == 304 and stored:
+            self.store.record_hit(key, len(stored[2]))
+            return self._cached_response(request, response, *stored)
+        self.store.record_miss()
+        if storable(request, response):
+            headers = {name: value for name, value in response.headers.items() if name.lower() not in _BODY_HEADERS}
+            self.store.put(key, response.headers["ETag"], headers, response.content)
+        return response
+
+    @staticmethod
+    def _cached_response(request, not_modified, etag, headers, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(headers)
+        # Fresh values (e.g. rate limit headers) from the 304 win over the stored ones
+        response.headers.update((name, value) for name, value in not_modified.headers.items()
+                                if name.lower() not in _BODY_HEADERS)
+        response._content = body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = not_modified.connection
+        response.elapsed = not_modified.elapsed
+        response.from_cache = True
+        not_modified.close()
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+# --- Shared store ---
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    """Returns the process-wide response store, opening it on first use, or None if GITLAB_HTTP_CACHE_PATH is empty."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            path = os.environ.get("GITLAB_HTTP_CACHE_PATH", DEFAULT_CACHE_PATH)
+            if not path:
+                return None
+            configured = os.environ.get("GITLAB_HTTP_CACHE_MB")
+            max_mb = int(configured) if configured and configured.isdigit() else DEFAULT_MAX_MB
+            _store = ResponseStore(path, max_bytes=max_mb * 1024 * 1024)
+        return _store
+
+def reset_store():
+    """Closes the shared store; the next get_store() opens GITLAB_HTTP_CACHE_PATH again."""
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = None
@@ -0,0 +1,203 @@
+import collections
+import contextlib
+import contextvars
+import re
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+# Number of individual request records kept in memory
+MAX_RECORDS = 10000
+
+# Path segments that are names rather than fixed parts of the endpoint
+_NAMED_SEGMENT_PARENTS = {"files", "tags", "branches", "variables", "protected_tags", "members"}
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+# Stack of open scopes (outermost = UI action, innermost = backend function).
+# A tuple so copies of the context in worker threads share the same scope objects.
+_scopes = contextvars.ContextVar("request_scopes", default=())
+
+
+def endpoint_template(url):
+    """Turns '/api/v4/projects/123/pipelines/456?page=2' into '/projects/:id/pipelines/:id'."""
+    path = urlsplit(url).path
+    if "/api/v4" in path:
+        path = path.split("/api/v4", 1)[1]
+    segments = []
+    previous = None
+    for segment in path.strip("/").split("/"):
+        if segment.isdigit():
+            segments.append(":id")
+        elif "%" in segment:
+            segments.append(":path")
+        elif _SHA_PATTERN.match(segment):
+            segments.append(":sha")
+        elif previous in _NAMED_SEGMENT_PARENTS:
+            segments.append(":name")
+        else:
+            segments.append(segment)
+        previous = segment
+    return "/" + "/".join(segments)
+
+
+def page_number(response):
+    """Page of a paginated listing this response belongs to (1 if not paginated)."""
+    page = response.headers.get("X-Page")
+    if page and page.isdigit():
+        return int(page)
+    query = parse_qs(urlsplit(str(response.url)).query)
+    if "page" in query and query["page"][0].isdigit():
+        return int(query["page"][0])
+    return 1
+
+
+class Scope:
+    """Requests made while one UI action or backend function was running."""
+    def __init__(self, name):
+        self.name = name
+        self.requests = 0
+        self.bytes = 0
+        self.http_seconds = 0.0
+        self.cache_hits = 0
+        self.max_page = 0
+        self.endpoints = collections.Counter()
+        self.statuses = collections.Counter()
+        self.start_time = time.perf_counter()
+        self.duration = None
+        self.lock = threading.Lock()
+
+    def add(self, record):
+        with self.lock:
+            self.requests += 1
+            self.bytes += record["bytes"]
+            self.http_seconds += record["latency"]
+            self.cache_hits += record["cached"]
+            self.max_page = max(self.max_page, record["page"])
+            self.endpoints[f"{record['method']} {record['endpoint']}"] += 1
+            self.statuses[record["status"]] += 1
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.start_time
+
+    def summary(self):
+        with self.lock:
+            return {
+                "name": self.name,
+                "requests": self.requests,
+                "bytes": self.bytes,
+                "http_seconds": self.http_seconds,
+                "cache_hits": self.cache_hits,
+                "duration": self.duration,
+                "pagination_depth": self.max_page,
+                "endpoints": dict(self.endpoints),
+                "statuses": dict(self.statuses),
+            }
+
+    def describe(self):
+        duration = self.duration if self.duration is not None else time.perf_counter() - self.start_time
+        cached = f" ({self.cache_hits} not modified)" if self.cache_hits else ""
+        return f"{self.name} = {self.requests} requests{cached}, {duration:.1f} s, {self.bytes / 1024:.1f} KB"
+
+
+class RequestLog:
+    """Thread-safe record of every instrumented request, groupable by action or backend function."""
+    def __init__(self, max_records=MAX_RECORDS):
+        self.records = collections.deque(maxlen=max_records)
+        self.actions = collections.deque(maxlen=max_records)
+        self.lock = threading.Lock()
+
+    def add(self, record):
+        with self.lock:
+            self.records.append(record)
+
+    def add_action(self, scope):
+        with self.lock:
+            self.actions.append(scope.summary())
+
+    def group_by(self, key):
+        """Aggregates the records by 'action', 'function' or 'endpoint'."""
+        groups = {}
+        with self.lock:
+            records = list(self.records)
+        for record in records:
+            group = groups.setdefault(record[key], {"requests": 0, "bytes": 0, "http_seconds": 0.0, "errors": 0})
+            group["requests"] += 1
+            group["bytes"] += record["bytes"]
+            group["http_seconds"] += record["latency"]
+            if record["status"] >= 400:
+                group["errors"] += 1
+        return groups
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+            self.actions.clear()
+
+
+# Process-wide request log
+log = RequestLog()
+
+
+@contextlib.contextmanager
+def scope(name):
+    """
+    Counts the requests made inside the block (including in worker threads started
+    with a copy of the context). The outermost open scope is the action.
+    """
+    new_scope = Scope(name)
+    token = _scopes.set(_scopes.get() + (new_scope,))
+    try:
+        yield new_scope
+    finally:
+        new_scope.finish()
+        _scopes.reset(token)
+        if not _scopes.get():
+            log.add_action(new_scope)
+
+
+def current_action():
+    scopes = _scopes.get()
+    return scopes[0].name if scopes else None
+
+def current_function():
+    scopes = _scopes.get()
+    return scopes[-1].name if scopes else None
+
+
+def _response_hook(response, *args, **kwargs):
+    cached = getattr(response, "from_cache", False)
+    if cached:
+        # Revalidated with a 304: the body came from the local HTTP cache
+        size = 0
+    elif kwargs.get("stream"):
+        size = int(response.headers.get("Content-Length") or 0)
+    else:
+        # Not streamed: requests reads the whole body right after the hooks anyway
+        size = len(response.content)
+    scopes = _scopes.get()
+    record = {
+        "method": response.request.method,
+        "endpoint": endpoint_template(str(response.url)),
+        "status": response.status_code,
+        "bytes": size,
+        "latency": response.elapsed.total_seconds(),
+        "cached": cached,
+        "page": page_number(response),
+        "action": scopes[0].name if scopes else None,
+        "function": scopes[-1].name if scopes else None,
+    }
+    log.add(record)
+    for open_scope in scopes:
+        open_scope.add(record)
+    return response
+
+
+def record_response(response):
+    """Records a response sent outside an instrumented session (the httpx client of async_backend)."""
+    _response_hook(response)
+
+def instrument(session):
+    """Installs the request recorder on a requests.Session (e.g. gl.session). Safe to call twice."""
+    if _response_hook not in session.hooks["response"]:
+        session.hooks["response"].append(_response_hook)
+    return session
@@ -0,0 +1,157 @@
+import concurrent.futures
+import contextvars
+import itertools
+import queue
+import threading
+
+# Number of backend tasks that can run at the same time
+DEFAULT_MAX_WORKERS = 4
+# How often (ms) the Tk thread collects results and progress from the workers
+POLL_INTERVAL_MS = 50
+
+# The job the current thread is running, so long loops can check for cancellation
+_current_job = contextvars.ContextVar("current_job", default=None)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once the user cancelled it."""
+
+
+def current_job():
+    return _current_job.get()
+
+def raise_if_cancelled():
+    """Stops the running job at this point if it was cancelled. Does nothing outside of a job."""
+    job = _current_job.get()
+    if job is not None and job.cancelled:
+        raise JobCancelled(job.name)
+
+def report_progress(message):
+    """Sends a progress message from inside a job to its on_progress callback."""
+    job = _current_job.get()
+    if job is not None:
+        job.report_progress(message)
+
+
+class Job:
+    """A backend task submitted to the JobExecutor."""
+    def __init__(self, executor, job_id, name, on_done=None, on_error=None, on_progress=None):
+        self.executor = executor
+        self.id = job_id
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.future = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    @property
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def cancel(self):
+        """Cancels the job: a queued job never starts, a running one stops at its next cancellation check."""
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def report_progress(self, message):
+        self.executor._events.put((self, "progress", message))
+
+
+class JobExecutor:
+    """
+    Runs backend tasks on a pool of worker threads so the Tk mainloop never waits
+    on GitLab. Results, errors and progress are queued by the workers and handed
+    to the callbacks on the Tk thread by a root.after polling loop.
+    """
+    def __init__(self, root, max_workers=DEFAULT_MAX_WORKERS, poll_interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gitlab-job")
+        self.jobs = {}
+        self._events = queue.Queue()
+        self._ids = itertools.count(1)
+        self._stopped = False
+        self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    def submit(self, name, func, *args, on_done=None, on_error=None, on_progress=None, **kwargs):
+        """
+        Runs func(*args, **kwargs) in the background and returns its Job.
+        on_done(result), on_error(exception) and on_progress(message) are called on the Tk thread.
+        """
+        job = Job(self, next(self._ids), name, on_done=on_done, on_error=on_error, on_progress=on_progress)
+        self.jobs[job.id] = job
+        job.future = self.pool.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        token = _current_job.set(job)
+        try:
+            raise_if_cancelled()
+            result = func(*args, **kwargs)
+            raise_if_cancelled()
+            self._events.put((job, "done", result))
+        except JobCancelled:
+            self._events.put((job, "cancelled", None))
+        except Exception as e:
+            self._events.put((job, "error", e))
+        finally:
+            _current_job.reset(token)
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    job, kind, payload = self._events.get_nowait()
+                except queue.Empty:
+                    break
+                self._safe_dispatch(job, kind, payload)
+            # A job cancelled before it started never reaches _run
+            for job in [job for job in self.jobs.values() if job.future.cancelled()]:
+                self._safe_dispatch(job, "cancelled", None)
+        finally:
+            # Rescheduled whatever happened, so later jobs are still delivered
+            if not self._stopped:
+                self._poll_id = self.root.after(self.poll_interval_ms, self._poll)
+
+    def _safe_dispatch(self, job, kind, payload):
+        try:
+            self._dispatch(job, kind, payload)
+        except Exception as e:
+            print(f"❌ Callback of task '{job.name}' failed: {e!r}")
+
+    def _dispatch(self, job, kind, payload):
+        if kind == "progress":
+            if job.on_progress:
+                job.on_progress(payload)
+            return
+
+        self.jobs.pop(job.id, None)
+        if kind == "done":
+            if job.on_done:
+                job.on_done(payload)
+        elif kind == "cancelled":
+            print(f"Task '{job.name}' cancelled.")
+        elif job.on_error:
+            job.on_error(payload)
+        else:
+            print(f"❌ Task '{job.name}' failed: {payload}")
+
+    def active_jobs(self):
+        return list(self.jobs.values())
+
+    def cancel_all(self):
+        for job in self.active_jobs():
+            job.cancel()
+
+    def shutdown(self):
+        """Cancels every job and stops polling. Running calls are not waited for."""
+        self.cancel_all()
+        self._stopped = True
+        self.root.after_cancel(self._poll_id)
+        self.pool.shutdown(wait=False, cancel_futures=True)
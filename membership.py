@@ -0,0 +1,170 @@
+import collections
+import concurrent.futures
+import contextvars
+import csv
+import time
+
+import gitlab
+import requests
+import yaml
+
+import jobs
+import object_cache
+import streaming
+
+# Writes applied at the same time
+DEFAULT_MAX_WORKERS = 8
+# Attempts per write; server errors and dropped connections are retried with backoff
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+# Role that removes the user from the group
+REMOVE = "NONE"
+
+Operation = collections.namedtuple("Operation", ["action", "group_id", "user_id", "access_level"])
+
+
+# --- Desired state ---
+def load_desired_state(path):
+    """
+    Reads (group, user, role) entries from a CSV file with a group,user,role header,
+    or from a YAML file holding either such a list or a {group: {user: role}} mapping.
+    Groups may be ids or full paths, users ids or usernames, roles GUEST..OWNER or NONE.
+    """
+    if path.endswith((".yml", ".yaml")):
+        with open(path) as f:
+            data = yaml.safe_load(f) or []
+        if isinstance(data, dict):
+            entries = [(group, user, role) for group, users in data.items() for user, role in (users or {}).items()]
+        else:
+            entries = [(item["group"], item["user"], item["role"]) for item in data]
+    else:
+        with open(path, newline="") as f:
+            entries = [(row["group"], row["user"], row["role"]) for row in csv.DictReader(f)]
+    return [(str(group).strip(), str(user).strip(), str(role).strip().upper()) for group, user, role in entries]
+
+
+def access_level(role):
+    """Access level of a role name, None for NONE (remove)."""
+    if role == REMOVE:
+        return None
+    return int(gitlab.const.AccessLevel[role])
+
+
+def _resolve(names, lookup, max_workers=DEFAULT_MAX_WORKERS):
+    """Maps ids/names to ids: numeric ids as they are, the names with lookup(name) on a bounded pool."""
+    resolved = {name: int(name) for name in set(names) if name.isdigit()}
+    pending = sorted(set(names) - set(resolved))
+    if pending:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+            lookups = [executor.submit(contextvars.copy_context().run, lookup, name) for name in pending]
+            for name, future in zip(pending, lookups):
+                resolved[name] = future.result()
+    return resolved
+
+def _resolve_groups(gl, groups):
+    """Maps group ids/paths to group ids (one lookup per path, none for numeric ids)."""
+    return _resolve(groups, lambda path: gl.groups.get(path).id)
+
+def _resolve_users(gl, users):
+    """Maps user ids/usernames to user ids (one lookup per username, none for numeric ids)."""
+    def lookup(username):
+        matches = gl.users.list(username=username)
+        if not matches:
+            raise ValueError(f"Unknown user '{username}'")
+        return matches[0].id
+    return _resolve(users, lookup)
+
+
+# --- Diff ---
+def fetch_current_members(gl, group_ids):
+    """Direct members of every group, fetched once per group: {group_id: {user_id: access_level}}."""
+    return {group_id: {m.id: m.access_level for m in streaming.iter_members(gl.groups.get(group_id, lazy=True))}
+            for group_id in group_ids}
+
+def plan(desired, current, prune=False):
+    """
+    Smallest list of operations turning `current` into `desired` (both {group_id: {user_id: level}},
+    level None meaning "remove"). With prune=True, members missing from `desired` are removed too,
+    except owners so a group cannot be locked out.
+    """
+    operations = []
+    for group_id, users in desired.items():
+        members = current.get(group_id, {})
+        for user_id, level in users.items():
+            if level is None:
+                if user_id in members:
+                    operations.append(Operation("remove", group_id, user_id, None))
+            elif user_id not in members:
+                operations.append(Operation("add", group_id, user_id, level))
+            elif members[user_id] != level:
+                operations.append(Operation("update", group_id, user_id, level))
+        if prune:
+            for user_id, level in members.items():
+                if user_id not in users and level < gitlab.const.AccessLevel.OWNER:
+                    operations.append(Operation("remove", group_id, user_id, None))
+    return operations
+
+
+# --- Apply ---
+# python-gitlab re-raises dropped connections and truncated bodies as plain requests exceptions
+WRITE_ERRORS = (gitlab.exceptions.GitlabError, requests.RequestException)
+
+def _retryable(e):
+    if isinstance(e, requests.RequestException):
+        return True
+    code = getattr(e, "response_code", None)
+    return code is None or code >= 500
+
+def apply_operation(gl, operation):
+    members = gl.groups.get(operation.group_id, lazy=True).members
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        jobs.raise_if_cancelled()
+        try:
+            if operation.action == "add":
+                members.create({"user_id": operation.user_id, "access_level": operation.access_level})
+            elif operation.action == "update":
+                members.update(operation.user_id, {"access_level": operation.access_level})
+            else:
+                members.delete(operation.user_id)
+            object_cache.invalidate_group_member(operation.group_id, operation.user_id)
+            return
+        except WRITE_ERRORS as e:
+            if attempt == MAX_ATTEMPTS or not _retryable(e):
+                raise
+            time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+def apply(gl, operations, max_workers=DEFAULT_MAX_WORKERS):
+    """Applies the operations concurrently. Returns (applied operations, {operation: error})."""
+    applied = []
+    errors = {}
+    if not operations:
+        return applied, errors
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(operations))) as executor:
+        futures = {executor.submit(contextvars.copy_context().run, apply_operation, gl, op): op for op in operations}
+        for future in concurrent.futures.as_completed(futures):
+            op = futures[future]
+            try:
+                future.result()
+                applied.append(op)
+            except WRITE_ERRORS as e:
+                errors[op] = e
+            jobs.report_progress(f"{len(applied) + len(errors)}/{len(operations)} membership changes")
+    return applied, errors
+
+
+def sync_memberships(gl, entries, prune=False, dry_run=False, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Brings group membership in line with the (group, user, role) entries.
+    Returns {"operations": [...], "applied": [...], "errors": {...}}; a re-run without changes plans nothing.
+    """
+    groups = _resolve_groups(gl, [group for group, _, _ in entries])
+    users = _resolve_users(gl, [user for _, user, _ in entries])
+    desired = {}
+    for group, user, role in entries:
+        desired.setdefault(groups[group], {})[users[user]] = access_level(role)
+
+    operations = plan(desired, fetch_current_members(gl, desired), prune=prune)
+    if dry_run:
+        return {"operations": operations, "applied": [], "errors": {}}
+    applied, errors = apply(gl, operations, max_workers=max_workers)
+    return {"operations": operations, "applied": applied, "errors": errors}
@@ -0,0 +1,181 @@
+import contextlib
+import contextvars
+import json
+import math
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets, Prometheus style
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+# Calls being tracked in the current context, innermost last; each is {"error": bool}
+_tracked = contextvars.ContextVar("tracked_calls", default=())
+
+
+def record_error():
+    """
+    Marks the innermost tracked call as failed, for functions that handle their
+    errors themselves (print and return) instead of raising. Does nothing outside track().
+    """
+    calls = _tracked.get()
+    if calls:
+        calls[-1]["error"] = True
+
+
+class FunctionMetrics:
+    """Call count, error count, in-flight gauge and latency histogram of one function."""
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+        self.min_seconds = None
+        self.max_seconds = None
+
+    def observe(self, seconds, error=False):
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total_seconds += seconds
+        self.min_seconds = seconds if self.min_seconds is None else min(self.min_seconds, seconds)
+        self.max_seconds = seconds if self.max_seconds is None else max(self.max_seconds, seconds)
+        for i, upper in enumerate(self.buckets):
+            if seconds <= upper:
+                self.bucket_counts[i] += 1
+                break
+
+    def quantile(self, q):
+        """Estimates a quantile (0-1) from the histogram by interpolating inside the bucket."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, bucket_count in zip(self.buckets, self.bucket_counts):
+            if bucket_count and seen + bucket_count >= rank:
+                if math.isinf(upper):
+                    return self.max_seconds
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = upper
+        return self.max_seconds
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "total_seconds": self.total_seconds,
+            "average_seconds": self.total_seconds / self.count if self.count else None,
+            "min_seconds": self.min_seconds,
+            "max_seconds": self.max_seconds,
+            "p50_seconds": self.quantile(0.5),
+            "p95_seconds": self.quantile(0.95),
+            "p99_seconds": self.quantile(0.99),
+            "buckets": {("+Inf" if math.isinf(upper) else str(upper)): bucket_count
+                        for upper, bucket_count in zip(self.buckets, self.bucket_counts)},
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry of per-function metrics, exportable as JSON or Prometheus text."""
+    def __init__(self, prefix="gitlab_backend", buckets=DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self.functions = {}
+        self.lock = threading.Lock()
+
+    def _get(self, name):
+        if name not in self.functions:
+            self.functions[name] = FunctionMetrics(self.buckets)
+        return self.functions[name]
+
+    @contextlib.contextmanager
+    def track(self, name):
+        """
+        Counts the wrapped block as one call of `name`: in-flight while it runs, then timed.
+        It is an error if it raised or called record_error().
+        """
+        with self.lock:
+            self._get(name).in_flight += 1
+        start_time = time.perf_counter()
+        call = {"error": False}
+        token = _tracked.set(_tracked.get() + (call,))
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            _tracked.reset(token)
+            error = error or call["error"]
+            duration = time.perf_counter() - start_time
+            with self.lock:
+                function_metrics = self._get(name)
+                function_metrics.in_flight -= 1
+                function_metrics.observe(duration, error=error)
+
+    # --- Queries ---
+    def get(self, name):
+        """Returns the metrics of one function as a dict (None if it was never called)."""
+        with self.lock:
+            function_metrics = self.functions.get(name)
+            return function_metrics.to_dict() if function_metrics else None
+
+    def snapshot(self):
+        with self.lock:
+            return {name: function_metrics.to_dict() for name, function_metrics in sorted(self.functions.items())}
+
+    def reset(self):
+        with self.lock:
+            self.functions.clear()
+
+    # --- Export ---
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self):
+        """Renders the registry in the Prometheus text exposition format."""
+        p = self.prefix
+        lines = [
+            f"# HELP {p}_calls_total Number of calls per backend function.",
+            f"# TYPE {p}_calls_total counter",
+        ]
+        with self.lock:
+            items = sorted(self.functions.items())
+            for name, m in items:
+                lines.append(f'{p}_calls_total{{function="{name}"}} {m.count}')
+            lines += [f"# HELP {p}_errors_total Number of calls that raised an exception or reported a handled error.",
+                      f"# TYPE {p}_errors_total counter"]
+            for name, m in items:
+                lines.append(f'{p}_errors_total{{function="{name}"}} {m.errors}')
+            lines += [f"# HELP {p}_in_flight Number of calls currently running.",
+                      f"# TYPE {p}_in_flight gauge"]
+            for name, m in items:
+                lines.append(f'{p}_in_flight{{function="{name}"}} {m.in_flight}')
+            lines += [f"# HELP {p}_latency_seconds Latency of backend functions.",
+                      f"# TYPE {p}_latency_seconds histogram"]
+            for name, m in items:
+                cumulative = 0
+                for upper, bucket_count in zip(m.buckets, m.bucket_counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if math.isinf(upper) else repr(upper)
+                    lines.append(f'{p}_latency_seconds_bucket{{function="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'{p}_latency_seconds_sum{{function="{name}"}} {m.total_seconds}')
+                lines.append(f'{p}_latency_seconds_count{{function="{name}"}} {m.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            f.write(self.to_json())
+
+    def write_prometheus(self, path):
+        with open(path, "w") as f:
+            f.write(self.to_prometheus())
+
+
+# Process-wide registry used by backend.time_it
+registry = MetricsRegistry()
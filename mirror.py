@@ -0,0 +1,249 @@
+import itertools
+import os
+import sqlite3
+import threading
+import time
+
+import fetch_engine
+import streaming
+
+# Location of the local mirror database (can be overridden from .env)
+DEFAULT_MIRROR_PATH = ".gitlab_mirror.db"
+# A project synced less than this many seconds ago is not synced again
+DEFAULT_MAX_AGE = 300
+# Pipeline states that will not change anymore, so their timing data can be stored
+FINISHED_PIPELINE_STATUSES = {"success", "failed", "canceled", "skipped", "manual"}
+# Process-wide version counter: a version is never reused, even by a mirror reopened on the same path
+_versions = itertools.count(1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipelines (
+    project_id  INTEGER NOT NULL,
+    id          INTEGER NOT NULL,
+    ref         TEXT,
+    status      TEXT,
+    source      TEXT,
+    created_at  TEXT,
+    updated_at  TEXT,
+    started_at  TEXT,
+    finished_at TEXT,
+    duration    REAL,
+    PRIMARY KEY (project_id, id)
+);
+CREATE TABLE IF NOT EXISTS issues (
+    project_id  INTEGER NOT NULL,
+    iid         INTEGER NOT NULL,
+    id          INTEGER,
+    title       TEXT,
+    state       TEXT,
+    created_at  TEXT,
+    updated_at  TEXT,
+    closed_at   TEXT,
+    PRIMARY KEY (project_id, iid)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project_id INTEGER NOT NULL,
+    resource   TEXT NOT NULL,
+    cursor     TEXT,
+    synced_at  REAL,
+    PRIMARY KEY (project_id, resource)
+);
+CREATE INDEX IF NOT EXISTS pipelines_status ON pipelines (project_id, status);
+CREATE INDEX IF NOT EXISTS issues_state ON issues (project_id, state);
+-- Commits used to be mirrored but nothing read them
+DROP TABLE IF EXISTS commits;
+DELETE FROM sync_state WHERE resource = 'commits';
+"""
+# Resources kept in sync per project
+RESOURCES = ("pipelines", "issues")
+
+
+class LocalMirror:
+    """
+    SQLite copy of the pipelines and issues of each project.
+    sync_project() only downloads the records that changed since the previous
+    sync (updated_after cursors), and the query methods read the local data.
+    Deleted pipelines and issues are never pruned: the incremental listings do not
+    report deletions, so they stay (and are counted by the reports) until the mirror file is removed.
+    """
+    def __init__(self, path=DEFAULT_MIRROR_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        # One connection shared by every thread, guarded by self.lock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        # Bumped on every write to a project, so derived copies (columnar arrays) know they are stale.
+        # Unwritten projects share the version taken when this mirror was opened.
+        self.opened_version = next(_versions)
+        self.versions = {}
+
+    def version(self, project_id):
+        return self.versions.get(int(project_id), self.opened_version)
+
+    def _changed(self, project_id):
+        self.versions[int(project_id)] = next(_versions)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # --- Sync state ---
+    def get_cursor(self, project_id, resource):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT cursor, synced_at FROM sync_state WHERE project_id = ? AND resource = ?",
+                (project_id, resource)).fetchone()
+        return row if row else (None, None)
+
+    def set_cursor(self, project_id, resource, cursor):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sync_state (project_id, resource, cursor, synced_at) VALUES (?, ?, ?, ?)",
+                (project_id, resource, cursor, time.time()))
+
+    def is_fresh(self, project_id, max_age=DEFAULT_MAX_AGE):
+        """True if every resource of the project was synced less than max_age seconds ago."""
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT synced_at FROM sync_state WHERE project_id = ? AND resource IN {RESOURCES}",
+                (project_id,)).fetchall()
+        if len(rows) < len(RESOURCES):
+            return False
+        return all(synced_at and time.time() - synced_at < max_age for (synced_at,) in rows)
+
+    # --- Incremental sync ---
+    def sync_project(self, project, max_workers=fetch_engine.DEFAULT_MAX_WORKERS):
+        """Pulls the pipelines and issues changed since the last sync. Returns the number of rows per resource."""
+        return {
+            "pipelines": self.sync_pipelines(project, max_workers=max_workers),
+            "issues": self.sync_issues(project),
+        }
+
+    # The listings are streamed and written one page at a time, so memory stays flat
+    # however large the delta is. Pipelines and issues come oldest update first, which
+    # lets the cursor move forward after every page: an interrupted sync resumes there.
+    def sync_pipelines(self, project, max_workers=fetch_engine.DEFAULT_MAX_WORKERS):
+        cursor, _ = self.get_cursor(project.id, "pipelines")
+        params = {"order_by": "updated_at", "sort": "asc"}
+        if cursor:
+            params["updated_after"] = cursor
+        total = 0
+        failed = False
+        for pipelines in streaming.batched(streaming.iter_pipelines(project, **params)):
+            # started_at/finished_at are only returned by the detail endpoint, so they
+            # are fetched for the finished pipelines of this delta only.
+            finished_ids = [p.id for p in pipelines if p.status in FINISHED_PIPELINE_STATUSES]
+            details, errors = fetch_engine.fetch_details(project.pipelines, finished_ids, max_workers=max_workers)
+            for pipeline_id, e in errors.items():
+                print(f"Error retrieving pipeline {pipeline_id}: {e}")
+            details = {p.id: p for p in details}
+
+            rows = []
+            for pipeline in pipelines:
+                full = details.get(pipeline.id)
+                rows.append((
+                    project.id, pipeline.id, pipeline.ref, pipeline.status,
+                    getattr(pipeline, "source", None), pipeline.created_at, pipeline.updated_at,
+                    getattr(full, "started_at", None), getattr(full, "finished_at", None),
+                    getattr(full, "duration", None),
+                ))
+            with self.lock, self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO pipelines VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._changed(project.id)
+            total += len(rows)
+            # Stop moving the cursor once some details failed, so they are pulled again next time
+            failed = failed or bool(errors)
+            if not failed:
+                cursor = max(pipelines[-1].updated_at, cursor or "")
+                self.set_cursor(project.id, "pipelines", cursor)
+        self.set_cursor(project.id, "pipelines", cursor)
+        return total
+
+    def sync_issues(self, project):
+        cursor, _ = self.get_cursor(project.id, "issues")
+        params = {"order_by": "updated_at", "sort": "asc", "state": "all"}
+        if cursor:
+            params["updated_after"] = cursor
+        total = 0
+        for issues in streaming.batched(streaming.iter_issues(project, **params)):
+            rows = [(project.id, issue.iid, issue.id, issue.title, issue.state,
+                     issue.created_at, issue.updated_at, issue.closed_at) for issue in issues]
+            with self.lock, self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._changed(project.id)
+            total += len(rows)
+            cursor = max(issues[-1].updated_at, cursor or "")
+            self.set_cursor(project.id, "issues", cursor)
+        self.set_cursor(project.id, "issues", cursor)
+        return total
+
+    # --- Queries ---
+    def iter_rows(self, sql, params=(), batch_size=streaming.PAGE_SIZE * 10):
+        """Yields the rows of a query in batches, holding the lock only while each batch is read."""
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+        try:
+            while True:
+                with self.lock:
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
+
+    def fetch_all(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def closed_issues(self, project_id, limit=None):
+        """Yields (iid, title, created_at, closed_at) of the closed issues of a project, latest closed first."""
+        sql = ("SELECT iid, title, created_at, closed_at FROM issues "
+               "WHERE project_id = ? AND state = 'closed' ORDER BY closed_at DESC")
+        if limit is None:
+            return self.iter_rows(sql, (project_id,))
+        return self.iter_rows(f"{sql} LIMIT ?", (project_id, limit))
+
+    def pipeline_status_counts(self, project_id):
+        """Returns a dict of pipeline status -> number of pipelines."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) FROM pipelines WHERE project_id = ? GROUP BY status",
+                (project_id,)).fetchall()
+        return dict(rows)
+
+    def pipeline_count(self, project_id):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM pipelines WHERE project_id = ?", (project_id,)).fetchone()[0]
+
+    def oldest_open_issue(self, project_id):
+        """Returns (iid, title, created_at) of the oldest open issue of a project, or None."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT iid, title, created_at FROM issues WHERE project_id = ? AND state = 'opened' "
+                "ORDER BY created_at LIMIT 1", (project_id,)).fetchone()
+
+
+# --- Shared mirror ---
+_mirror = None
+_mirror_lock = threading.Lock()
+
+def get_mirror():
+    """Returns the process-wide mirror, opening it on first use."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = LocalMirror(os.environ.get("GITLAB_MIRROR_PATH", DEFAULT_MIRROR_PATH))
+        return _mirror
+
+def reset_mirror():
+    """Closes the shared mirror; the next get_mirror() opens GITLAB_MIRROR_PATH again."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is not None:
+            _mirror.close()
+        _mirror = None
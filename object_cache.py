@@ -0,0 +1,142 @@
+import collections
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+# Seconds an object stays valid (GITLAB_CACHE_TTL overrides it)
+DEFAULT_TTL = 60
+# Objects kept before the least recently used one is evicted (GITLAB_CACHE_SIZE overrides it)
+DEFAULT_MAX_ENTRIES = 512
+
+# Kinds of cached objects
+PROJECT = "project"
+GROUP = "group"
+GROUP_MEMBER = "group_member"
+PROJECT_MEMBER = "project_member"
+
+
+def _env_number(name, default):
+    configured = os.environ.get(name)
+    if configured and configured.isdigit():
+        return int(configured)
+    return default
+
+
+class ObjectCache:
+    """
+    Read-through cache of GitLab objects keyed by (kind, id), with a TTL and LRU eviction.
+    Loads happen outside the lock, so a slow request never blocks other lookups.
+    """
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()   # (kind, id) -> (expires at, object), oldest first
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(kind, object_id):
+        # "42" and 42 are the same object; paths stay strings
+        if isinstance(object_id, str) and object_id.isdigit():
+            object_id = int(object_id)
+        return kind, object_id
+
+    def get(self, kind, object_id, load):
+        """Returns the cached object, or calls load() and caches its result. Errors are not cached."""
+        key = self.key(kind, object_id)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = load()
+        self.put(kind, object_id, value)
+        return value
+
+    def put(self, kind, object_id, value):
+        key = self.key(kind, object_id)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, kind, object_id):
+        with self.lock:
+            if self.entries.pop(self.key(kind, object_id), None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and the hit rate (0-1, None before the first lookup)."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+
+# --- Shared cache ---
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """
+    Returns the process-wide cache, created on first use so GITLAB_CACHE_TTL /
+    GITLAB_CACHE_SIZE from .env are read after it has been loaded.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            load_dotenv()
+            _cache = ObjectCache(ttl=_env_number("GITLAB_CACHE_TTL", DEFAULT_TTL),
+                                 max_entries=_env_number("GITLAB_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        return _cache
+
+
+# --- Typed lookups ---
+def get_project(gl, project_id):
+    return get_cache().get(PROJECT, project_id, lambda: gl.projects.get(project_id))
+
+def get_group(gl, group_id):
+    return get_cache().get(GROUP, group_id, lambda: gl.groups.get(group_id))
+
+def get_group_member(gl, group_id, user_id):
+    return get_cache().get(GROUP_MEMBER, (int(group_id), int(user_id)),
+                           lambda: get_group(gl, group_id).members.get(user_id))
+
+def get_project_member(project, user_id):
+    return get_cache().get(PROJECT_MEMBER, (project.id, int(user_id)), lambda: project.members.get(user_id))
+
+def invalidate_project(project_id):
+    get_cache().invalidate(PROJECT, project_id)
+
+def invalidate_group(group_id):
+    get_cache().invalidate(GROUP, group_id)
+
+def invalidate_group_member(group_id, user_id):
+    get_cache().invalidate(GROUP_MEMBER, (int(group_id), int(user_id)))
+
+def invalidate_project_member(project_id, user_id):
+    get_cache().invalidate(PROJECT_MEMBER, (int(project_id), int(user_id)))
@@ -0,0 +1,103 @@
+import concurrent.futures
+import contextvars
+import time
+from datetime import datetime, timezone
+
+import gitlab
+
+import columnar
+import fetch_engine
+import jobs
+import mirror
+import scheduler
+import streaming
+
+# Projects analysed at the same time. Each one may also run parallel detail calls,
+# the shared request scheduler keeps the total within the connection pool.
+DEFAULT_MAX_WORKERS = 8
+# Rows shown in each ranked table
+DEFAULT_TOP = 10
+
+
+def analyse_project(gl, project_id, name=None, max_age=mirror.DEFAULT_MAX_AGE):
+    """
+    Syncs one project into the local mirror and returns its portfolio metrics.
+    A failure is recorded in the result ("error") instead of being raised.
+    """
+    result = {"project_id": project_id, "name": name or str(project_id), "error": None}
+    local_mirror = mirror.get_mirror()
+    try:
+        if not (max_age and local_mirror.is_fresh(project_id, max_age)):
+            local_mirror.sync_project(gl.projects.get(project_id, lazy=True))
+    except gitlab.exceptions.GitlabError as e:
+        # Keep going with whatever was mirrored before
+        result["error"] = str(e)
+
+    pipelines = columnar.load_pipelines(local_mirror, project_id)
+    run_time = columnar.stats(pipelines.durations())
+    time_to_close = columnar.stats(columnar.load_issues(local_mirror, project_id).time_to_close())
+    oldest = local_mirror.oldest_open_issue(project_id)
+
+    result.update({
+        "total_pipelines": len(pipelines),
+        "success_rate": round(pipelines.success_rate(), 1) if len(pipelines) else None,
+        "average_run_time": run_time["average"],
+        "p95_run_time": run_time["p95"],
+        "closed_issues": time_to_close["count"],
+        "average_time_to_close": time_to_close["average"],
+        "oldest_open_issue": None,
+    })
+    if oldest:
+        iid, title, created_at = oldest
+        age = datetime.now(timezone.utc).replace(tzinfo=None) - fetch_engine.parse_timestamp(created_at)
+        result["oldest_open_issue"] = {"iid": iid, "title": title, "created_at": created_at,
+                                       "age_seconds": age.total_seconds()}
+    return result
+
+
+def run_portfolio(gl, projects=None, max_workers=DEFAULT_MAX_WORKERS, max_age=mirror.DEFAULT_MAX_AGE):
+    """
+    Analyses every project ({project_id: name}, default: all owned projects) with a
+    bounded pool of workers at BULK priority. Returns the per-project results; a
+    project that failed only has its own result marked with the error.
+    """
+    if projects is None:
+        projects = {p.id: p.name_with_namespace for p in streaming.iter_projects(gl, owned=True)}
+    results = {}
+    start_time = time.perf_counter()
+    with scheduler.priority(scheduler.BULK), \
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="portfolio") as executor:
+        futures = {
+            executor.submit(contextvars.copy_context().run, analyse_project, gl, project_id, name, max_age): project_id
+            for project_id, name in projects.items()
+        }
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                project_id = futures[future]
+                try:
+                    results[project_id] = future.result()
+                except jobs.JobCancelled:
+                    raise
+                except Exception as e:
+                    results[project_id] = {"project_id": project_id, "name": projects[project_id], "error": str(e)}
+                jobs.report_progress(f"{len(results)}/{len(projects)} projects analysed")
+        except jobs.JobCancelled:
+            for future in futures:
+                future.cancel()
+            raise
+    print(f"Analysed {len(results)} projects in {time.perf_counter() - start_time:.1f} seconds.")
+    return results
+
+
+def rank(results, top=DEFAULT_TOP):
+    """Builds the ranked tables: slowest pipelines, lowest success rate and oldest open issues."""
+    rows = list(results.values())
+    timed = [r for r in rows if r.get("p95_run_time") is not None]
+    with_pipelines = [r for r in rows if r.get("success_rate") is not None]
+    with_open_issues = [r for r in rows if r.get("oldest_open_issue")]
+    return {
+        "slowest_pipelines": sorted(timed, key=lambda r: r["p95_run_time"], reverse=True)[:top],
+        "lowest_success_rate": sorted(with_pipelines, key=lambda r: r["success_rate"])[:top],
+        "oldest_open_issues": sorted(with_open_issues, key=lambda r: r["oldest_open_issue"]["age_seconds"], reverse=True)[:top],
+        "failed_projects": [r for r in rows if r.get("error")],
+    }
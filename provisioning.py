@@ -0,0 +1,160 @@
+import concurrent.futures
+import contextvars
+import csv
+import time
+
+import gitlab
+import requests
+import yaml
+
+import jobs
+import object_cache
+import scheduler
+
+# Default files added to new projects: repository path -> local path
+TEMPLATE_FILES = {
+    '.gitlab-ci.yml': 'template/template.yml',
+    '.gitignore': 'template/gitignore.txt',
+    'cliff.toml': 'template/cliff.toml',
+    'public/index.html': 'template/index.html',
+    'create_failure_issue.py': 'template/create_failure_issue.py',
+}
+TEMPLATE_BRANCH = 'main'
+# Projects provisioned at the same time (each one runs two of its steps in parallel)
+DEFAULT_MAX_WORKERS = 4
+
+
+# --- Template ---
+def read_template_files(files=TEMPLATE_FILES):
+    """Reads the local template files into commit actions. Raises FileNotFoundError naming the missing file."""
+    actions = []
+    for repo_path, local_path in files.items():
+        with open(local_path, "r") as f:
+            actions.append({'action': 'create', 'file_path': repo_path, 'content': f.read()})
+    return actions
+
+def commit_template_files(project, actions, branch=TEMPLATE_BRANCH):
+    """Adds all the template files in one commit (one request) instead of one commit per file."""
+    return project.commits.create({
+        'branch': branch,
+        'commit_message': f'Add default CI/CD files ({len(actions)} files)',
+        'actions': actions,
+    })
+
+
+# --- One project ---
+def _timed_step(timings, step, func, *args, **kwargs):
+    start_time = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[step] = time.perf_counter() - start_time
+
+def provision_project(gl, project_name, namespace_id, template_files=TEMPLATE_FILES, actions=None):
+    """
+    Creates a project with the default tag rule, template files and first tag.
+    Reading the template overlaps the create call, and the protected tag rule is set
+    while the files are committed in one go; v1.0.0 is tagged last so it includes them.
+    Returns (project, {step: seconds}, error of a later step or None); raises
+    GitlabError if the project itself cannot be created.
+    """
+    timings = {}
+    error = None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="provision") as executor:
+        if actions is None:
+            actions = executor.submit(contextvars.copy_context().run, _timed_step, timings, 'read_template',
+                                      read_template_files, template_files)
+        project = _timed_step(timings, 'create_project', gl.projects.create,
+                              {'name': project_name, 'namespace_id': namespace_id, 'initialize_with_readme': True})
+        object_cache.get_cache().put(object_cache.PROJECT, project.id, project)
+        try:
+            protected_tag = executor.submit(contextvars.copy_context().run, _timed_step, timings, 'protected_tag',
+                                            project.protectedtags.create,
+                                            {'name': 'v*', 'create_access_level': gitlab.const.AccessLevel.MAINTAINER})
+            if isinstance(actions, concurrent.futures.Future):
+                actions = actions.result()
+            _timed_step(timings, 'template_commit', commit_template_files, project, actions)
+            protected_tag.result()
+            _timed_step(timings, 'tag', project.tags.create, {'tag_name': 'v1.0.0', 'ref': TEMPLATE_BRANCH})
+        except (OSError, gitlab.exceptions.GitlabError, requests.RequestException) as e:
+            error = str(e)
+    return project, timings, error
+
+
+# --- Manifest ---
+def load_manifest(path):
+    """
+    Reads (project name, group) entries from a CSV file with a name,group header, or from
+    a YAML file holding either a list of {name, group} items or a {group: [names]} mapping.
+    Groups may be ids or full paths; an empty group means the default group of the caller.
+    """
+    if path.endswith((".yml", ".yaml")):
+        with open(path) as f:
+            data = yaml.safe_load(f) or []
+        if isinstance(data, dict):
+            entries = [(name, group) for group, names in data.items() for name in (names or [])]
+        else:
+            entries = [(item["name"], item.get("group")) for item in data]
+    else:
+        with open(path, newline="") as f:
+            entries = [(row["name"], row.get("group")) for row in csv.DictReader(f)]
+    return [(str(name).strip(), str(group).strip() if group not in (None, "") else None) for name, group in entries]
+
+def _resolve_namespaces(gl, groups):
+    """Maps group ids/paths to namespace ids (one lookup per path, none for numeric ids)."""
+    return {group: int(group) if group.isdigit() else object_cache.get_group(gl, group).id for group in set(groups)}
+
+
+# --- Batch ---
+def provision_all(gl, entries, default_group=None, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Provisions every (name, group) entry with at most max_workers projects in flight.
+    A failure only affects its own project. Returns one result per entry, in manifest order:
+    {"name", "group", "status": "created" | "partial" | "failed", "project", "seconds", "timings", "error"}.
+    """
+    results = [{"name": name, "group": group or default_group, "status": "failed",
+                "project": None, "seconds": None, "timings": {}, "error": None} for name, group in entries]
+    namespaces = {}
+    for result in results:
+        if result["group"] is None:
+            result["error"] = "No group given"
+            continue
+        try:
+            namespaces.update(_resolve_namespaces(gl, [str(result["group"])]))
+        except (gitlab.exceptions.GitlabError, requests.RequestException) as e:
+            result["error"] = f"Unknown group {result['group']}: {e}"
+    todo = [r for r in results if r["error"] is None]
+    if not todo:
+        return results
+
+    # The template is read once for the whole batch
+    actions = read_template_files()
+
+    def provision(result):
+        jobs.raise_if_cancelled()
+        start_time = time.perf_counter()
+        project, timings, error = provision_project(gl, result["name"], namespaces[str(result["group"])],
+                                                    actions=actions)
+        result.update(project=project, seconds=time.perf_counter() - start_time, timings=timings, error=error,
+                      status="partial" if error else "created")
+
+    with scheduler.priority(scheduler.BULK), \
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="provision-batch") as executor:
+        futures = {executor.submit(contextvars.copy_context().run, provision, result): result for result in todo}
+        done = 0
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    future.result()
+                except jobs.JobCancelled:
+                    raise
+                except Exception as e:
+                    # Network, file or manifest errors included: only this entry fails, the batch goes on
+                    futures[future].update(status="failed", error=str(e))
+                done += 1
+                jobs.report_progress(f"{done}/{len(todo)} projects provisioned")
+        except jobs.JobCancelled:
+            for future in futures:
+                future.cancel()
+            raise
+    return results
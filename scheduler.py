@@ -0,0 +1,181 @@
+import contextlib
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+
+from requests.adapters import BaseAdapter
+
+import jobs
+
+# Request priorities: lower runs first
+INTERACTIVE = 0
+BULK = 10
+
+# Below this share of the rate-limit budget the scheduler stops growing and backs off
+LOW_BUDGET_RATIO = 0.1
+# Times a 429 response is retried by the adapter before it is handed to python-gitlab
+MAX_THROTTLE_RETRIES = 5
+# Longest a waiting request sleeps before checking for cancellation again
+WAIT_SLICE = 0.5
+
+_priority = contextvars.ContextVar("request_priority", default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def priority(level):
+    """Requests made inside the block (and in worker threads copying its context) use this priority."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority():
+    return _priority.get()
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """
+    Admits HTTP requests in priority order under an adaptive concurrency limit.
+    The limit grows by one after each window of successful requests and is halved
+    on a 429. The RateLimit-* and Retry-After headers of every response are tracked,
+    and admission pauses until the reset time when the budget runs out.
+    """
+    def __init__(self, max_limit, min_limit=1, initial_limit=None):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = initial_limit or max(min_limit, max_limit // 2)
+        self.in_flight = 0
+        self.remaining = None
+        self.paused_until = 0.0
+        self.throttled = 0
+        self.successes = 0
+        self.waiting = []
+        self.sequence = itertools.count()
+        self.cond = threading.Condition()
+
+    def acquire(self, level=None):
+        """Blocks until a request of this priority may be sent."""
+        level = current_priority() if level is None else level
+        with self.cond:
+            ticket = (level, next(self.sequence))
+            heapq.heappush(self.waiting, ticket)
+            try:
+                while True:
+                    delay = self.paused_until - time.monotonic()
+                    if self.waiting[0] == ticket and self.in_flight < self.limit and delay <= 0:
+                        break
+                    self.cond.wait(timeout=min(delay, WAIT_SLICE) if delay > 0 else WAIT_SLICE)
+                    jobs.raise_if_cancelled()
+            except BaseException:
+                self.waiting.remove(ticket)
+                heapq.heapify(self.waiting)
+                self.cond.notify_all()
+                raise
+            heapq.heappop(self.waiting)
+            self.in_flight += 1
+            # The next request in line may fit in the remaining capacity too
+            self.cond.notify_all()
+
+    def release(self, response=None):
+        """Frees the slot and adapts the limit to the response (None if the request failed)."""
+        with self.cond:
+            self.in_flight -= 1
+            if response is not None:
+                self._update(response)
+            self.cond.notify_all()
+
+    def _update(self, response):
+        headers = response.headers
+        remaining = _number(headers.get("RateLimit-Remaining"))
+        budget = _number(headers.get("RateLimit-Limit"))
+        reset = _number(headers.get("RateLimit-Reset"))
+        retry_after = _number(headers.get("Retry-After"))
+
+        if response.status_code == 429:
+            self.throttled += 1
+            self.successes = 0
+            self.limit = max(self.min_limit, self.limit // 2)
+            if retry_after is None:
+                retry_after = reset - time.time() if reset else 1.0
+            self._pause(retry_after)
+            return
+
+        if remaining is not None:
+            self.remaining = int(remaining)
+            if remaining <= 0:
+                self._pause(reset - time.time() if reset else 1.0)
+                self.limit = self.min_limit
+                return
+            if budget and remaining < budget * LOW_BUDGET_RATIO:
+                self.limit = max(self.min_limit, self.limit - 1)
+                self.successes = 0
+                return
+
+        # Additive increase: one more slot after `limit` successful requests
+        self.successes += 1
+        if self.successes >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+            self.successes = 0
+
+    def _pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + max(seconds, 0))
+
+    def stats(self):
+        with self.cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "waiting": len(self.waiting),
+                "remaining": self.remaining,
+                "throttled": self.throttled,
+                "paused_for": max(0.0, self.paused_until - time.monotonic()),
+            }
+
+
+class ScheduledAdapter(BaseAdapter):
+    """Transport adapter that sends every request through a RequestScheduler and retries 429s."""
+    def __init__(self, inner, scheduler, max_throttle_retries=MAX_THROTTLE_RETRIES):
+        super().__init__()
+        self.inner = inner
+        self.scheduler = scheduler
+        self.max_throttle_retries = max_throttle_retries
+
+    def send(self, request, **kwargs):
+        for attempt in range(self.max_throttle_retries + 1):
+            self.scheduler.acquire()
+            response = None
+            try:
+                response = self.inner.send(request, **kwargs)
+            finally:
+                self.scheduler.release(response)
+            if response.status_code != 429 or attempt == self.max_throttle_retries:
+                return response
+            # The scheduler now pauses until Retry-After, so the next acquire() waits for it
+            response.close()
+        return response
+
+    def close(self):
+        self.inner.close()
+
+
+# --- Shared scheduler ---
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler(max_limit=None):
+    """Returns the process-wide scheduler, creating it with max_limit slots on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(max_limit or 8)
+        return _scheduler
@@ -0,0 +1,65 @@
+import bisect
+import collections
+import re
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+class SearchIndex:
+    """
+    Type-ahead index over the entries of a picker, each (key, label, search text).
+    An entry matches when the query is a substring of its text (case-insensitive).
+    Matches starting a word (name, namespace path segment, id) are found with a
+    bisect over the sorted words and come first; for the others only the entries
+    holding the query's rarest trigram are checked.
+    A query extending the previous one only filters the previous result.
+    """
+    def __init__(self, entries=()):
+        self.keys = []
+        self.labels = []
+        self.texts = []       # position -> lowercase search text
+        words = []            # (word, position)
+        self.trigrams = collections.defaultdict(list)  # trigram -> [position], ascending
+        for position, (key, label, text) in enumerate(entries):
+            text = text.lower()
+            self.keys.append(key)
+            self.labels.append(label)
+            self.texts.append(text)
+            words.extend((word, position) for word in set(_WORD.findall(text)))
+            for trigram in {text[i:i + 3] for i in range(len(text) - 2)}:
+                self.trigrams[trigram].append(position)
+        words.sort()
+        self.words = [word for word, _ in words]
+        self.word_positions = [position for _, position in words]
+        self.last_query = ""
+        self.last_result = list(range(len(self.keys)))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _prefix_matches(self, query):
+        start = bisect.bisect_left(self.words, query)
+        end = bisect.bisect_left(self.words, query + "\uffff", start)
+        return set(self.word_positions[start:end])
+
+    def _substring_candidates(self, query):
+        if len(query) < 3:
+            return range(len(self.texts))
+        return min((self.trigrams.get(query[i:i + 3], ()) for i in range(len(query) - 2)), key=len)
+
+    def search(self, query):
+        """Returns the positions of the matching entries: word-prefix matches first, each part in entry order."""
+        query = query.strip().lower()
+        if not query:
+            result = list(range(len(self.keys)))
+        else:
+            if self.last_query and query.startswith(self.last_query):
+                candidates = self.last_result
+            else:
+                candidates = self._substring_candidates(query)
+            texts = self.texts
+            matches = [position for position in candidates if query in texts[position]]
+            prefix = self._prefix_matches(query)
+            result = sorted(p for p in matches if p in prefix) + sorted(p for p in matches if p not in prefix)
+        self.last_query, self.last_result = query, result
+        return result
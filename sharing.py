@@ -0,0 +1,112 @@
+import threading
+
+import object_cache
+import streaming
+
+
+class SharingMatrix:
+    """
+    Project x group sharing matrix. Groups get a column index; each project's row is an
+    int bitmask of the groups it is shared with, so lookups and updates are local and O(1).
+    Owned groups (the ones a project can be shared with from the UI) have their own mask.
+    """
+    def __init__(self):
+        self.group_ids = []        # column index -> group id
+        self.group_names = []      # column index -> group name
+        self.group_index = {}      # group id -> column index
+        self.owned_mask = 0        # columns of the owned groups
+        self.rows = {}             # project id -> bitmask of shared groups
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    # --- Loading ---
+    def _column(self, group_id, name):
+        column = self.group_index.get(group_id)
+        if column is None:
+            column = len(self.group_ids)
+            self.group_index[group_id] = column
+            self.group_ids.append(group_id)
+            self.group_names.append(name)
+        return column
+
+    def add_group(self, group_id, name, owned=True):
+        with self.lock:
+            column = self._column(int(group_id), name)
+            if owned:
+                self.owned_mask |= 1 << column
+
+    def set_project(self, project_id, shared_with_groups):
+        """Sets a project's row from its shared_with_groups attribute (list of {group_id, group_name})."""
+        with self.lock:
+            row = 0
+            for shared in shared_with_groups:
+                row |= 1 << self._column(int(shared["group_id"]), shared["group_name"])
+            self.rows[int(project_id)] = row
+
+    # --- Local updates after a share/unshare succeeded ---
+    def share(self, project_id, group_id, name=None):
+        with self.lock:
+            column = self._column(int(group_id), name or str(group_id))
+            self.rows[int(project_id)] = self.rows.get(int(project_id), 0) | 1 << column
+
+    def unshare(self, project_id, group_id):
+        with self.lock:
+            column = self.group_index.get(int(group_id))
+            if column is not None and int(project_id) in self.rows:
+                self.rows[int(project_id)] &= ~(1 << column)
+
+    # --- Lookups ---
+    def has_project(self, project_id):
+        return int(project_id) in self.rows
+
+    def is_shared(self, project_id, group_id):
+        column = self.group_index.get(int(group_id))
+        return column is not None and bool(self.rows.get(int(project_id), 0) >> column & 1)
+
+    def _groups(self, mask):
+        return [(self.group_ids[c], self.group_names[c]) for c in range(mask.bit_length()) if mask >> c & 1]
+
+    def shared_groups(self, project_id):
+        """[(group_id, name)] the project is shared with."""
+        with self.lock:
+            return self._groups(self.rows.get(int(project_id), 0))
+
+    def unshared_groups(self, project_id):
+        """[(group_id, name)] of the owned groups the project is not shared with yet."""
+        with self.lock:
+            return self._groups(self.owned_mask & ~self.rows.get(int(project_id), 0))
+
+    def projects_shared_with(self, group_id):
+        column = self.group_index.get(int(group_id))
+        if column is None:
+            return []
+        with self.lock:
+            return [project_id for project_id, row in self.rows.items() if row >> column & 1]
+
+
+def build_matrix(gl):
+    """
+    Loads the matrix with two paginated listings: the owned groups, and the owned
+    projects, whose list entries already carry shared_with_groups.
+    """
+    matrix = SharingMatrix()
+    for group in streaming.iter_groups(gl, owned=True):
+        matrix.add_group(group.id, group.name)
+    for project in streaming.iter_projects(gl, owned=True):
+        matrix.set_project(project.id, project.shared_with_groups)
+    return matrix
+
+def load_project(gl, matrix, project_id):
+    """Adds (or refreshes) one project's row from the server, e.g. a project created after loading."""
+    project = object_cache.get_project(gl, project_id)
+    matrix.set_project(project.id, project.shared_with_groups)
+    return project
+
+def verify_project(gl, matrix, project_id):
+    """Re-reads a project's sharing from the server; returns True if the local row was already right."""
+    before = matrix.rows.get(int(project_id))
+    object_cache.invalidate_project(project_id)
+    load_project(gl, matrix, project_id)
+    return before == matrix.rows.get(int(project_id))
@@ -0,0 +1,66 @@
+import json
+import os
+import time
+
+import catalog
+
+# Bumped when the layout changes; an older snapshot is ignored
+SNAPSHOT_VERSION = 2
+
+
+def snapshot_path():
+    return os.environ.get("GITLAB_SNAPSHOT_PATH", ".gitlab_snapshot.json")
+
+
+class Snapshot:
+    """
+    Last known state of the account, used to draw the window before any request is made:
+    the group/project catalog, the project names and the groups whose token variable exists.
+    """
+    def __init__(self, gitlab_url=None, catalog_data=None, projects=None, variables=None, saved_at=None):
+        self.gitlab_url = gitlab_url
+        self.catalog = catalog.Catalog.from_dict(catalog_data or {})
+        self.projects = projects or {}        # project id -> {"name": name_with_namespace, "path": path_with_namespace}
+        self.variables = set(variables or ())  # group ids where GITLAB_PRIVATE_TOKEN is set
+        self.saved_at = saved_at              # when the data was fetched, not when the file was written
+
+    def age(self):
+        return time.time() - self.saved_at if self.saved_at else None
+
+    def to_dict(self):
+        return {
+            "version": SNAPSHOT_VERSION,
+            "gitlab_url": self.gitlab_url,
+            "saved_at": self.saved_at,
+            "catalog": self.catalog.to_dict(),
+            "projects": self.projects,
+            "variables": sorted(self.variables),
+        }
+
+
+def load(gitlab_url=None, path=None):
+    """Returns the saved Snapshot, or an empty one if there is none, it is unreadable or it belongs to another instance."""
+    path = path or snapshot_path()
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return Snapshot(gitlab_url)
+    if data.get("version") != SNAPSHOT_VERSION or data.get("gitlab_url") != gitlab_url:
+        return Snapshot(gitlab_url)
+    return Snapshot(
+        gitlab_url,
+        catalog_data=data.get("catalog"),
+        # JSON object keys are strings
+        projects={int(project_id): details for project_id, details in data.get("projects", {}).items()},
+        variables=[str(group_id) for group_id in data.get("variables", [])],
+        saved_at=data.get("saved_at"),
+    )
+
+def save(snapshot, path=None):
+    """Writes the snapshot atomically, so a crash mid-write never leaves a truncated file."""
+    path = path or snapshot_path()
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(snapshot.to_dict(), f)
+    os.replace(temporary, path)
@@ -0,0 +1,49 @@
+import itertools
+
+import jobs
+
+# Records per page; also the batch size used when streams are written somewhere
+PAGE_SIZE = 100
+
+
+# --- Generic helpers ---
+def stream(manager, **filters):
+    """
+    Yields the records of a listing page by page: only the current page is held in
+    memory. Stops between records if the running job was cancelled.
+    """
+    for record in manager.list(iterator=True, per_page=PAGE_SIZE, **filters):
+        jobs.raise_if_cancelled()
+        yield record
+
+def batched(records, size=PAGE_SIZE):
+    """Groups a stream into lists of at most `size` records."""
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+# --- Streams ---
+# Keyset pagination is used where GitLab supports it (projects by id): it does not
+# slow down on deep pages and stays consistent while records are added.
+def iter_projects(gl, **filters):
+    return stream(gl.projects, pagination="keyset", order_by="id", sort="asc", **filters)
+
+def iter_groups(gl, **filters):
+    # Keyset pagination of groups is only offered to unauthenticated requests: offset pages here
+    return stream(gl.groups, order_by="name", sort="asc", **filters)
+
+def iter_members(group_or_project):
+    return stream(group_or_project.members)
+
+def iter_pipelines(project, **filters):
+    return stream(project.pipelines, **filters)
+
+def iter_issues(project, **filters):
+    return stream(project.issues, **filters)
+
+def iter_commits(project, **filters):
+    return stream(project.commits, **filters)
@@ -0,0 +1,119 @@
+import concurrent.futures
+import contextvars
+import hashlib
+import os
+
+import gitlab
+
+import jobs
+import provisioning
+import scheduler
+import streaming
+
+# Projects checked at the same time
+DEFAULT_MAX_WORKERS = 8
+
+
+# --- Local bundle ---
+def git_blob_sha(content):
+    """SHA-1 git gives a file's blob: the same id repository_tree reports, so no download is needed to compare."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+def load_bundle(files=provisioning.TEMPLATE_FILES):
+    """Reads and hashes the template once: {repo_path: (blob sha, content)}."""
+    bundle = {}
+    for repo_path, local_path in files.items():
+        with open(local_path, "rb") as f:
+            content = f.read()
+        bundle[repo_path] = (git_blob_sha(content), content.decode("utf-8"))
+    return bundle
+
+
+# --- One project ---
+def remote_blob_shas(project, paths, ref):
+    """
+    Blob ids of the given paths on ref, read from one tree listing per directory
+    (two calls for the default template). Missing paths are left out.
+    """
+    shas = {}
+    for directory in sorted({os.path.dirname(path) for path in paths}):
+        try:
+            tree = project.repository_tree(path=directory or None, ref=ref, get_all=True)
+        except gitlab.exceptions.GitlabGetError as e:
+            if e.response_code == 404:
+                # Directory (or the whole repository) does not exist yet
+                continue
+            raise
+        shas.update({entry["path"]: entry["id"] for entry in tree if entry["type"] == "blob"})
+    return {path: sha for path, sha in shas.items() if path in paths}
+
+def diff_actions(bundle, remote):
+    """Commit actions for the files that are missing or whose blob differs."""
+    actions = []
+    for path, (sha, content) in bundle.items():
+        if path not in remote:
+            actions.append({'action': 'create', 'file_path': path, 'content': content})
+        elif remote[path] != sha:
+            actions.append({'action': 'update', 'file_path': path, 'content': content})
+    return actions
+
+def sync_project(gl, project_id, bundle, ref=None, dry_run=False):
+    """
+    Brings one project's template files in line with the bundle with at most one commit.
+    Returns {"project_id", "status": "up_to_date" | "updated" | "would_update", "files"}.
+    """
+    project = gl.projects.get(project_id, lazy=True)
+    ref = ref or provisioning.TEMPLATE_BRANCH
+    actions = diff_actions(bundle, remote_blob_shas(project, set(bundle), ref))
+    result = {"project_id": project_id, "status": "up_to_date", "files": [a["file_path"] for a in actions]}
+    if not actions:
+        return result
+    if dry_run:
+        result["status"] = "would_update"
+        return result
+    jobs.raise_if_cancelled()
+    project.commits.create({
+        'branch': ref,
+        'commit_message': f'Sync template files ({len(actions)} files)',
+        'actions': actions,
+    })
+    result["status"] = "updated"
+    return result
+
+
+# --- Fleet ---
+def sync_fleet(gl, projects=None, files=provisioning.TEMPLATE_FILES, dry_run=False, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Syncs the template to every project ({project_id: (name, default branch)}, default: all
+    owned projects) with a bounded pool at BULK priority. A failure only marks its own
+    project ("failed" with the error). Returns {project_id: result}.
+    """
+    bundle = load_bundle(files)
+    if projects is None:
+        projects = {p.id: (p.name_with_namespace, getattr(p, "default_branch", None))
+                    for p in streaming.iter_projects(gl, owned=True)}
+    results = {}
+    with scheduler.priority(scheduler.BULK), \
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="template-sync") as executor:
+        futures = {
+            executor.submit(contextvars.copy_context().run, sync_project, gl, project_id, bundle, ref, dry_run): project_id
+            for project_id, (name, ref) in projects.items()
+        }
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                project_id = futures[future]
+                try:
+                    result = future.result()
+                except jobs.JobCancelled:
+                    raise
+                except Exception as e:
+                    # Network errors included: only this project fails, the fleet sync goes on
+                    result = {"project_id": project_id, "status": "failed", "files": [], "error": str(e)}
+                result["name"] = projects[project_id][0]
+                results[project_id] = result
+                jobs.report_progress(f"{len(results)}/{len(projects)} projects checked")
+        except jobs.JobCancelled:
+            for future in futures:
+                future.cancel()
+            raise
+    return results